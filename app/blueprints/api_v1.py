@@ -21,7 +21,7 @@ from werkzeug.utils import secure_filename
 
 from app import limiter, login_username_key
 from app.access import user_has_conversation_access
-from app.conversation_id import parse_conversation_id
+from app.conversation_id import dm_conversation_id, parse_conversation_id
 from app.htmx_oob import oob_to_selector
 from app.models import (
     Channel,
@@ -49,7 +49,9 @@ from app.services.image_processing import reencode_avatar
 from app.services.upload_validation import (
     ALLOWED_EXTENSIONS,
     AVATAR_EXTENSIONS,
+    REENCODED_EXTENSIONS,
     ValidationError,
+    stream_size,
     validate_upload,
 )
 from app.sso import oauth
@@ -246,6 +248,11 @@ def api_upload_file():
     if file_ext not in ALLOWED_EXTENSIONS:
         return jsonify({"error": "File type not allowed."}), 400
 
+    # Only images can shrink on the way to storage; anything else over the
+    # limit is rejected before it touches disk, libmagic or Pillow.
+    if file_ext not in REENCODED_EXTENSIONS and stream_size(file) > MAX_CONTENT_LENGTH:
+        return jsonify({"error": "File exceeds maximum size limit"}), 400
+
     stored_filename = f"{uuid.uuid4()}.{file_ext}"
     temp_dir = os.path.join(current_app.instance_path, "temp_uploads")
     os.makedirs(temp_dir, exist_ok=True)
@@ -690,8 +697,7 @@ def create_dm():
     if not other_user:
         return jsonify({"error": "User not found"}), 404
 
-    user_ids = sorted([g.api_user.id, other_user.id])
-    conv_id_str = f"dm_{user_ids[0]}_{user_ids[1]}"
+    conv_id_str = dm_conversation_id(g.api_user.id, other_user.id)
 
     conversation, created = Conversation.get_or_create(
         conversation_id_str=conv_id_str, defaults={"type": "dm"}
@@ -1437,10 +1443,7 @@ def api_search():
 
     people_out = list()
     for u in user_query:
-        # Construct the expected dm_conv_id string (IDs sorted ascending)
-        user_ids = list((g.api_user.id, u.id))
-        user_ids.sort()
-        expected_dm_str = f"dm_{user_ids[0]}_{user_ids[1]}"
+        expected_dm_str = dm_conversation_id(g.api_user.id, u.id)
         dm_conv_id = expected_dm_str if expected_dm_str in dm_set else None
 
         people_out.append(
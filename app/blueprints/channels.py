@@ -14,7 +14,7 @@ from peewee import JOIN, IntegrityError
 
 from app import external_url_for
 from app.chat_manager import chat_manager
-from app.conversation_id import parse_conversation_id
+from app.conversation_id import dm_conversation_id, parse_conversation_id
 from app.htmx_oob import oob_by_id, oob_to_selector
 from app.models import (
     Channel,
@@ -82,7 +82,7 @@ def get_channel_chat(channel_id):
     messages = list(
         Message.select()
         .where(Message.conversation == conversation)
-        .order_by(Message.created_at.desc())
+        .order_by(Message.id.desc())
         .limit(PAGE_SIZE)
     )
     messages.reverse()
@@ -734,14 +734,14 @@ def leave_channel(channel_id):
     remove_from_list_html = oob_by_id(f"channel-item-{int(channel_id)}", "delete")
 
     user_self = g.user
-    conv_id_str_self = f"dm_{user_self.id}_{user_self.id}"
+    conv_id_str_self = dm_conversation_id(user_self.id, user_self.id)
     conversation_self, _ = Conversation.get_or_create(
         conversation_id_str=conv_id_str_self, defaults={"type": "dm"}
     )
     messages_query = (
         Message.select()
         .where(Message.conversation == conversation_self)
-        .order_by(Message.created_at.desc())
+        .order_by(Message.id.desc())
         .limit(PAGE_SIZE)
     )
 
@@ -4,7 +4,7 @@
 from flask import Blueprint, g, make_response, render_template, request, url_for
 
 from app.chat_manager import chat_manager
-from app.conversation_id import parse_conversation_id
+from app.conversation_id import dm_conversation_id, parse_conversation_id
 from app.htmx_oob import oob_by_id
 from app.models import Conversation, Message, User, UserConversationStatus, utc_now
 from app.routes import (
@@ -22,42 +22,63 @@ DM_SEARCH_PAGE_SIZE = 20
 dms_bp = Blueprint("dms", __name__)
 
 
-@dms_bp.route("/chat/dms/start", methods=["GET"])
-@login_required
-def get_start_dm_form():
-    """
-    Renders the modal for starting a new DM, showing the first page of available users.
+def _dm_partner_ids(user):
     """
-    # Local Variables
-    page = 1
+    IDs of everyone `user` already has a DM open with, plus `user` themself,
+    for excluding from the "start a DM" suggestions.
 
-    # Get the IDs of users the current user ALREADY has a DM with.
-    dm_conversations = (
-        Conversation.select()
+    The partner is only recorded in the conversation id string ("dm_4_5"), so
+    this reads just that column for the user's DMs and parses it; there's no
+    per-user lookup, and the exclusion goes back to the database as one
+    NOT IN.
+    """
+    partner_ids = {user.id}
+    dm_conversation_ids = (
+        Conversation.select(Conversation.conversation_id_str)
         .join(UserConversationStatus)
-        .where((UserConversationStatus.user == g.user) & (Conversation.type == "dm"))
+        .where((UserConversationStatus.user == user) & (Conversation.type == "dm"))
+        .tuples()
     )
-    existing_partner_ids = {g.user.id}
-    for conv in dm_conversations:
+    for (conv_id_str,) in dm_conversation_ids:
         try:
-            user_ids = parse_conversation_id(conv.conversation_id_str).user_ids
+            user_ids = parse_conversation_id(conv_id_str).user_ids
         except ValueError:
             continue
-        partner_id = next((uid for uid in user_ids if uid != g.user.id), None)
+        partner_id = next((uid for uid in user_ids if uid != user.id), None)
         if partner_id:
-            existing_partner_ids.add(partner_id)
+            partner_ids.add(partner_id)
+    return partner_ids
+
+
+def _paginate_users(query, page):
+    """
+    Returns one page of `query` and whether another page follows it.
+
+    Fetches a single row past the page instead of running a separate
+    COUNT(*): if that extra row comes back, there is more to load.
+    """
+    offset = max(page - 1, 0) * DM_SEARCH_PAGE_SIZE
+    users = list(query.offset(offset).limit(DM_SEARCH_PAGE_SIZE + 1))
+    return users[:DM_SEARCH_PAGE_SIZE], len(users) > DM_SEARCH_PAGE_SIZE
+
+
+@dms_bp.route("/chat/dms/start", methods=["GET"])
+@login_required
+def get_start_dm_form():
+    """
+    Renders the modal for starting a new DM, showing the first page of available users.
+    """
+    # Local Variables
+    page = 1
 
     # Base query for users not already in a DM, ordered alphabetically
     query = (
         User.select()
-        .where(User.id.not_in(list(existing_partner_ids)))
+        .where(User.id.not_in(list(_dm_partner_ids(g.user))))
         .order_by(User.username)
     )
 
-    # Paginate the results
-    total_users = query.count()
-    users_for_page = query.paginate(page, DM_SEARCH_PAGE_SIZE)
-    has_more_pages = total_users > (page * DM_SEARCH_PAGE_SIZE)
+    users_for_page, has_more_pages = _paginate_users(query, page)
 
     # Render the main modal shell, which includes the first page of results.
     return render_template(
@@ -98,29 +119,12 @@ def search_users_for_dm():
     else:
         # Browse mode (no query): suggest people you're NOT already DMing, so
         # the "start a new conversation" list doesn't repeat the sidebar.
-        dm_conversations = (
-            Conversation.select()
-            .join(UserConversationStatus)
-            .where(
-                (UserConversationStatus.user == g.user) & (Conversation.type == "dm")
-            )
-        )
-        existing_partner_ids = {g.user.id}
-        for conv in dm_conversations:
-            try:
-                user_ids = parse_conversation_id(conv.conversation_id_str).user_ids
-            except ValueError:
-                continue
-            partner_id = next((uid for uid in user_ids if uid != g.user.id), None)
-            if partner_id:
-                existing_partner_ids.add(partner_id)
-
-        query = User.select().where(User.id.not_in(list(existing_partner_ids)))
+        query = User.select().where(User.id.not_in(list(_dm_partner_ids(g.user))))
 
     # Get the next (or first) batch of users
-    total_users = query.count()
-    users_for_page = query.order_by(User.username).paginate(page, DM_SEARCH_PAGE_SIZE)
-    has_more_pages = total_users > (page * DM_SEARCH_PAGE_SIZE)
+    users_for_page, has_more_pages = _paginate_users(
+        query.order_by(User.username), page
+    )
 
     # This will load the users with the load more button setup for the next batch
     return render_template(
@@ -143,30 +147,43 @@ def get_dm_chat(other_user_id):
     if not other_user:
         return "User not found", 404
 
-    # Make sure there are conversation records for both users
-    user_ids = sorted([g.user.id, other_user.id])
-    conv_id_str = f"dm_{user_ids[0]}_{user_ids[1]}"
-    conversation, _ = Conversation.get_or_create(
-        conversation_id_str=conv_id_str, defaults={"type": "dm"}
-    )
-
-    # Ensure a conversation status record exists for both users.
-    status, created = UserConversationStatus.get_or_create(
-        user=g.user, conversation=conversation
-    )
-    UserConversationStatus.get_or_create(user=other_user, conversation=conversation)
+    # Make sure there are conversation records for both users. Missing rows
+    # are written with INSERT ... ON CONFLICT DO NOTHING rather than
+    # get_or_create: no SELECT-then-INSERT per row, and two tabs opening the
+    # same DM at once can't trip over each other.
+    conv_id_str = dm_conversation_id(g.user.id, other_user.id)
+    Conversation.insert(
+        conversation_id_str=conv_id_str, type="dm"
+    ).on_conflict_ignore().execute()
+    conversation = Conversation.get(conversation_id_str=conv_id_str)
+
+    # The current user's status tells a brand-new DM from a reopened one.
+    status = UserConversationStatus.get_or_none(user=g.user, conversation=conversation)
+    created = status is None
+    now = utc_now()
 
     # This is the timestamp of the last message the current user has seen.
-    last_read_timestamp = status.last_read_timestamp
-
-    # Now, update the timestamp for ONLY the current user to mark messages as read.
-    status.last_read_timestamp = utc_now()
-    status.save()
+    last_read_timestamp = now if created else status.last_read_timestamp
+
+    # Ensure a conversation status record exists for both users (one row when
+    # DMing yourself), in a single INSERT.
+    UserConversationStatus.insert_many(
+        [
+            {"user": uid, "conversation": conversation}
+            for uid in {g.user.id, other_user.id}
+        ]
+    ).on_conflict_ignore().execute()
+
+    # Now, update the timestamp for ONLY the current user to mark messages as
+    # read. A freshly inserted status already carries "now".
+    if not created:
+        status.last_read_timestamp = now
+        status.save()
 
     messages = list(
         Message.select()
         .where(Message.conversation == conversation)
-        .order_by(Message.created_at.desc())
+        .order_by(Message.id.desc())
         .limit(PAGE_SIZE)
     )
     messages.reverse()
@@ -280,8 +297,7 @@ def leave_dm(other_user_id):
     'Leaves' a DM by deleting the UserConversationStatus for the current user.
     """
     # Find the conversation
-    user_ids = sorted([g.user.id, other_user_id])
-    conv_id_str = f"dm_{user_ids[0]}_{user_ids[1]}"
+    conv_id_str = dm_conversation_id(g.user.id, other_user_id)
     conversation = Conversation.get_or_none(conversation_id_str=conv_id_str)
 
     # Delete the status record for the current user, effectively hiding the DM
@@ -10,7 +10,9 @@ from app.routes import login_required
 from app.services import minio_service
 from app.services.upload_validation import (
     ALLOWED_EXTENSIONS,
+    REENCODED_EXTENSIONS,
     ValidationError,
+    stream_size,
     validate_upload,
 )
 
@@ -58,6 +60,11 @@ def upload_file():
             error="File type not allowed. Files must have an extension (e.g., .png, .jpg)."
         ), 400
 
+    # Only images can shrink on the way to storage; anything else over the
+    # limit is rejected before it touches disk, libmagic or Pillow.
+    if file_ext not in REENCODED_EXTENSIONS and stream_size(file) > MAX_CONTENT_LENGTH:
+        return jsonify(error="File exceeds maximum size limit"), 400
+
     stored_filename = f"{uuid.uuid4()}.{file_ext}"
     temp_dir = os.path.join(current_app.instance_path, "temp_uploads")
     os.makedirs(temp_dir, exist_ok=True)
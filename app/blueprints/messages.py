@@ -388,22 +388,30 @@ def get_messages_page(conversation_id):
     if not user_has_conversation_access(g.user, parsed):
         return "Unauthorized", 403
 
+    # Keyset pagination on (conversation, id): each page is an index range
+    # scan however deep the user has scrolled. Ids are strictly increasing,
+    # unlike created_at, so messages sharing a timestamp can't fall between
+    # two pages. One extra row tells us whether another page exists.
     if fetching_older:
-        condition = Message.created_at < cursor_message.created_at
-        order = Message.created_at.desc()
+        condition = Message.id < cursor_message.id
+        order = Message.id.desc()
         template = "partials/message_batch.html"
     else:
-        condition = Message.created_at > cursor_message.created_at
-        order = Message.created_at.asc()
+        condition = Message.id > cursor_message.id
+        order = Message.id.asc()
         template = "partials/message_batch_newer.html"
 
     query = (
         Message.select()
         .where((Message.conversation == conversation) & condition)
         .order_by(order)
-        .limit(PAGE_SIZE)
+        .limit(PAGE_SIZE + 1)
     )
-    messages = list(reversed(query)) if fetching_older else list(query)
+    messages = list(query)
+    has_more = len(messages) > PAGE_SIZE
+    messages = messages[:PAGE_SIZE]
+    if fetching_older:
+        messages.reverse()
     # For a newer batch the cursor sits directly above it, so grouping can
     # continue across the seam. An older batch is prepended above unknown
     # (unloaded) history, so it starts a fresh group.
@@ -416,7 +424,7 @@ def get_messages_page(conversation_id):
         template,
         messages=messages,
         conversation_id=conversation_id,
-        PAGE_SIZE=PAGE_SIZE,
+        has_more=has_more,
         reactions_map=reactions_map,
         attachments_map=attachments_map,
         Message=Message,
@@ -453,7 +461,7 @@ def jump_to_message(message_id):
         .where(
             (Message.conversation == conversation) & (Message.id < target_message.id)
         )
-        .order_by(Message.created_at.desc())
+        .order_by(Message.id.desc())
         .limit(30)
     )
     messages_before.reverse()
@@ -462,7 +470,7 @@ def jump_to_message(message_id):
         .where(
             (Message.conversation == conversation) & (Message.id > target_message.id)
         )
-        .order_by(Message.created_at.asc())
+        .order_by(Message.id.asc())
         .limit(30)
     )
     messages = messages_before + [target_message] + messages_after
@@ -375,11 +375,17 @@ class ChatManager:
         self.redis_client.publish(redis_channel, json.dumps(payload_data))
 
     def _handle_disconnect(self, ws):
-        owner = None
-        for uid, socket_set in list(self.all_clients.items()):
-            if ws in socket_set:
-                owner = uid
-                break
+        # Sockets carry their user (set on connect), so the owner is normally
+        # an O(1) lookup. Scanning every user's socket set instead made a
+        # fan-out that hit many dead sockets quadratic in connected users; the
+        # scan is kept only as a fallback for sockets without a matching user.
+        owner = getattr(getattr(ws, "user", None), "id", None)
+        if ws not in self.all_clients.get(owner, ()):
+            owner = None
+            for uid, socket_set in list(self.all_clients.items()):
+                if ws in socket_set:
+                    owner = uid
+                    break
         if owner is not None:
             self.set_offline(owner, ws)
         self.unsubscribe(ws)
@@ -5,7 +5,8 @@ Conversations are identified throughout the app by string keys stored on
 `Conversation.conversation_id_str`:
 
 - ``channel_<id>`` — a workspace channel.
-- ``dm_<u1>_<u2>[_<u3>...]`` — a direct message between two or more users.
+- ``dm_<u1>_<u2>[_<u3>...]`` — a direct message between two or more users,
+  ids ascending. Build two-person keys with ``dm_conversation_id``.
 
 Several blueprints accept these strings directly from URLs (e.g.
 ``/api/v1/conversations/<conv_id_str>/messages``). Inline ``split('_')`` /
@@ -65,3 +66,17 @@ def parse_conversation_id(conv_id_str: str) -> ConversationKey:
         return ConversationKey(type="dm", user_ids=tuple(ids))
 
     raise ValueError(f"unknown conversation type {kind!r} in {conv_id_str!r}")
+
+
+def dm_conversation_id(user_a_id: int, user_b_id: int) -> str:
+    """
+    Build the ``dm_<lo>_<hi>`` key for a DM between two users, in either
+    argument order. DMing yourself gives ``dm_<id>_<id>``.
+
+    This runs on every DM open and once per row of the API people list, so it
+    orders the pair with a single comparison instead of building and sorting
+    a list.
+    """
+    if user_a_id > user_b_id:
+        user_a_id, user_b_id = user_b_id, user_a_id
+    return f"dm_{user_a_id}_{user_b_id}"
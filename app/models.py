@@ -53,6 +53,7 @@ def initialize_db(app):
     """
     Initializes the database connection using the URI from the app's config.
     Uses a connection pool for PostgreSQL to prevent connection exhaustion.
+    SQLite connections apply the optional DATABASE_PRAGMAS setting.
     """
     db_url = app.config["DATABASE_URI"]
     if db_url.startswith(("postgresql://", "postgres://")):
@@ -60,7 +61,8 @@ def initialize_db(app):
         pool_url = db_url.replace(f"{scheme}://", f"{scheme}+pool://", 1)
         database = connect(pool_url, max_connections=15, stale_timeout=300)
     else:
-        database = connect(db_url)
+        pragmas = app.config.get("DATABASE_PRAGMAS")
+        database = connect(db_url, pragmas=pragmas) if pragmas else connect(db_url)
     db.initialize(database)
 
 
@@ -220,6 +222,13 @@ class Message(BaseModel):
     last_reply_at = DateTimeField(null=True)
     quoted_message = DeferredForeignKey("Message", backref="quotes", null=True)
 
+    class Meta:
+        """Peewee Meta class."""
+
+        # History pages are keyset scans: WHERE conversation = ? AND id < ?
+        # ORDER BY id DESC. This index serves both the filter and the order.
+        indexes = ((("conversation", "id"), False),)
+
     @property
     def attachments(self):
         """Returns a query for all UploadedFile objects attached to this message."""
@@ -24,6 +24,11 @@ from app.models import (
 )
 from app.services import push_service
 
+# An @word that starts the text or follows whitespace, an opening bracket or a
+# quote (so e-mail addresses don't count). Compiled once; every message send
+# runs it.
+_MENTION_RE = re.compile(r"(?<![^\s(\['\"])@(\w+)")
+
 
 def handle_new_message(
     sender: User,
@@ -76,58 +81,60 @@ def handle_new_message(
                 MessageAttachment.create(message=new_message, attachment=file_id)
 
         # --- Mention handling logic ---
+        # Most messages mention nobody; without an "@" there is nothing to
+        # parse and no channel lookup to make.
+        has_mentions = "@" in chat_text
+
+        # Everyone this message mentions, collected first so the Mention rows
+        # go in as one INSERT and nobody is mentioned twice.
+        mentioned_user_ids = set()
+
         # 1. Handle regular @username mentions
-        mention_pattern = r"(?<![^\s(\['\"])@(\w+)"
-        mentioned_usernames = set(re.findall(mention_pattern, chat_text))
+        mentioned_usernames = (
+            set(_MENTION_RE.findall(chat_text)) if has_mentions else set()
+        )
         mentioned_usernames.discard("here")
         mentioned_usernames.discard("channel")
 
         if mentioned_usernames:
-            mentioned_users = User.select().where(
+            mentioned_users = User.select(User.id).where(
                 User.username.in_(list(mentioned_usernames))
             )
-            for mentioned_user in mentioned_users:
-                # check to prevent users from creating a mention for themselves
-                if mentioned_user.id != sender.id:
-                    Mention.get_or_create(user=mentioned_user, message=new_message)
+            mentioned_user_ids.update(uid for (uid,) in mentioned_users.tuples())
 
         # 2. Handle @channel and @here mentions (only applies to channels)
-        if conversation.type == "channel":
-            channel = Channel.get_by_id(
-                parse_conversation_id(conversation.conversation_id_str).channel_id
+        if has_mentions and conversation.type == "channel":
+            channel_id = parse_conversation_id(
+                conversation.conversation_id_str
+            ).channel_id
+            member_ids_query = ChannelMember.select(ChannelMember.user_id).where(
+                ChannelMember.channel == channel_id
             )
-            target_users_for_mention = set()
 
             # Handle @channel - all members
             if "@channel" in chat_text:
-                all_members = (
-                    User.select()
-                    .join(ChannelMember)
-                    .where(ChannelMember.channel == channel)
-                )
-                for member in all_members:
-                    target_users_for_mention.add(member)
+                mentioned_user_ids.update(uid for (uid,) in member_ids_query.tuples())
 
-            # Handle @here - only online members
+            # Handle @here - only online members. The online filter runs in
+            # SQL so a large channel doesn't ship every member id back.
             if "@here" in chat_text:
-                member_ids_query = ChannelMember.select(ChannelMember.user_id).where(
-                    ChannelMember.channel == channel
-                )
-                member_ids = {m.user_id for m in member_ids_query}
-                online_channel_members_ids = member_ids.intersection(
-                    chat_manager.online_user_ids()
-                )
-                if online_channel_members_ids:
-                    online_users = User.select().where(
-                        User.id.in_(list(online_channel_members_ids))
+                online_ids = chat_manager.online_user_ids()
+                if online_ids:
+                    online_members = member_ids_query.where(
+                        ChannelMember.user.in_(list(online_ids))
                     )
-                    for member in online_users:
-                        target_users_for_mention.add(member)
-
-            # 3. Create Mention records for the collected users
-            for user_to_mention in target_users_for_mention:
-                if user_to_mention.id != sender.id:
-                    Mention.get_or_create(user=user_to_mention, message=new_message)
+                    mentioned_user_ids.update(uid for (uid,) in online_members.tuples())
+
+        # 3. Create Mention records for the collected users, in one INSERT.
+        # Users can't mention themselves.
+        mentioned_user_ids.discard(sender.id)
+        if mentioned_user_ids:
+            Mention.insert_many(
+                [
+                    {"user": user_id, "message": new_message}
+                    for user_id in mentioned_user_ids
+                ]
+            ).execute()
 
         # --- Hashtag handling logic ---
         # 1. Find all potential hashtags in the message content.
@@ -163,51 +170,86 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
     # Determine who the members of the conversation are
     if conversation.type == "channel":
         channel = Channel.get_by_id(parsed_conv.channel_id)
-        members = (
-            User.select().join(ChannelMember).where(ChannelMember.channel == channel)
-        )
+        member_ids = [
+            user_id
+            for (user_id,) in ChannelMember.select(ChannelMember.user)
+            .where(ChannelMember.channel == channel)
+            .tuples()
+        ]
     else:  # DM
-        members = User.select().where(User.id.in_(list(parsed_conv.user_ids)))
-
-    # Loop through every member to see if they need a notification
-    for member in members:
-        # Condition 1: Don't notify the sender or any offline users (cluster-aware)
-        if member.id == sender_user.id or not chat_manager.is_user_online_in_cluster(
-            member.id
-        ):
-            continue
+        member_ids = parsed_conv.user_ids
+
+    # Don't notify the sender or any offline users (cluster-aware)
+    recipient_ids = [
+        user_id
+        for user_id in dict.fromkeys(member_ids)
+        if user_id != sender_user.id and chat_manager.is_user_online_in_cluster(user_id)
+    ]
+
+    # Everything below is looked up for all recipients at once rather than
+    # per member: their read statuses, who this message mentions (from the
+    # raw FK column), and each mentioned recipient's unread mention count.
+    statuses = {
+        status.user_id: status
+        for status in UserConversationStatus.select().where(
+            (UserConversationStatus.conversation == conversation)
+            & (UserConversationStatus.user.in_(recipient_ids))
+        )
+    }
+    for user_id in recipient_ids:
+        if user_id not in statuses:
+            statuses[user_id], _ = UserConversationStatus.get_or_create(
+                user=user_id, conversation=conversation
+            )
 
-        # Condition 2: Check viewing status via 'exclude_channel' in send_to_user payload
+    mentioned_user_ids = {
+        user_id
+        for (user_id,) in Mention.select(Mention.user)
+        .where(Mention.message == new_message)
+        .tuples()
+    }
 
-        status, _ = UserConversationStatus.get_or_create(
-            user=member, conversation=conversation
+    unread_mention_counts = {}
+    mentioned_recipient_ids = mentioned_user_ids.intersection(recipient_ids)
+    if conversation.type == "channel" and mentioned_recipient_ids:
+        unread_mention_counts = dict(
+            Mention.select(Mention.user, fn.COUNT(Mention.message))
+            .join(Message)
+            .join(
+                UserConversationStatus,
+                on=(
+                    (UserConversationStatus.user == Mention.user)
+                    & (UserConversationStatus.conversation == Message.conversation)
+                ),
+            )
+            .where(
+                (Message.conversation == conversation)
+                & (Message.created_at > UserConversationStatus.last_read_timestamp)
+                & (Mention.user.in_(list(mentioned_recipient_ids)))
+            )
+            .group_by(Mention.user)
+            .tuples()
         )
+
+    # Recipients who get a sound/desktop notification; their
+    # last_notified_timestamp is stamped in one UPDATE after the loop.
+    now = utc_now()
+    notified_ids = []
+
+    # Loop through every recipient to see if they need a notification
+    for member_id in recipient_ids:
+        # Viewing status is handled via 'exclude_channel' in send_to_user
+        status = statuses[member_id]
         notification_html = None
 
         if conversation.type == "channel":
-            channel_model = Channel.get_by_id(parsed_conv.channel_id)
-            link_text = f"# {channel_model.name}"
-            hx_get_url = url_for(
-                "channels.get_channel_chat", channel_id=channel_model.id
-            )
+            link_text = f"# {channel.name}"
+            hx_get_url = url_for("channels.get_channel_chat", channel_id=channel.id)
 
-            is_mention = (
-                Mention.select()
-                .where((Mention.message == new_message) & (Mention.user == member))
-                .exists()
-            )
+            is_mention = member_id in mentioned_user_ids
 
             if is_mention:
-                total_unread_mentions = (
-                    Mention.select()
-                    .join(Message)
-                    .where(
-                        (Message.created_at > status.last_read_timestamp)
-                        & (Mention.user == member)
-                        & (Message.conversation == conversation)
-                    )
-                    .count()
-                )
+                total_unread_mentions = unread_mention_counts.get(member_id, 0)
                 notification_html = render_template(
                     "partials/unread_badge.html",
                     conv_id_str=conv_id_str,
@@ -220,7 +262,7 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
                 .where(
                     (Message.conversation == conversation)
                     & (Message.created_at > status.last_read_timestamp)
-                    & (Message.user != member)
+                    & (Message.user != member_id)
                 )
                 .exists()
             ):
@@ -238,7 +280,7 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
                 .where(
                     (Message.conversation == conversation)
                     & (Message.created_at > status.last_read_timestamp)
-                    & (Message.user != member)
+                    & (Message.user != member_id)
                 )
                 .count()
             )
@@ -267,25 +309,18 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
             }
 
             chat_manager.send_to_user(
-                member.id,
+                member_id,
                 {"_raw_html": notification_html, "api_data": api_data},
                 exclude_channel=conv_id_str,
             )
             chat_manager.send_to_user(
-                member.id, unread_link_html, exclude_channel=conv_id_str
+                member_id, unread_link_html, exclude_channel=conv_id_str
             )
 
         # Sound and Desktop Notification Logic (remains the same)
-        now = utc_now()
-        is_a_mention = (
-            Mention.select()
-            .where((Mention.message == new_message) & (Mention.user == member))
-            .exists()
-        )
-
-        if is_a_mention:
+        if member_id in mentioned_user_ids:
             chat_manager.send_to_user(
-                member.id, {"type": "sound"}, exclude_channel=conv_id_str
+                member_id, {"type": "sound"}, exclude_channel=conv_id_str
             )
             notification_payload = {
                 "type": "notification",
@@ -296,17 +331,16 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
                 "tag": conv_id_str,
             }
             chat_manager.send_to_user(
-                member.id, notification_payload, exclude_channel=conv_id_str
+                member_id, notification_payload, exclude_channel=conv_id_str
             )
-            status.last_notified_timestamp = now
-            status.save()
+            notified_ids.append(member_id)
         elif conversation.type == "dm":
             should_notify = status.last_notified_timestamp is None or (
                 now - status.last_notified_timestamp
             ) > datetime.timedelta(seconds=10)
             if should_notify:
                 chat_manager.send_to_user(
-                    member.id, {"type": "sound"}, exclude_channel=conv_id_str
+                    member_id, {"type": "sound"}, exclude_channel=conv_id_str
                 )
                 notification_payload = {
                     "type": "notification",
@@ -317,10 +351,17 @@ def send_notifications_for_new_message(new_message: Message, sender_user: User):
                     "tag": conv_id_str,
                 }
                 chat_manager.send_to_user(
-                    member.id, notification_payload, exclude_channel=conv_id_str
+                    member_id, notification_payload, exclude_channel=conv_id_str
                 )
-                status.last_notified_timestamp = now
-                status.save()
+                notified_ids.append(member_id)
+
+    if notified_ids:
+        UserConversationStatus.update(
+            last_notified_timestamp=now, updated_at=now
+        ).where(
+            (UserConversationStatus.conversation == conversation)
+            & (UserConversationStatus.user.in_(notified_ids))
+        ).execute()
 
     _dispatch_push_notifications(new_message, sender_user, conversation, parsed_conv)
 
@@ -350,8 +391,7 @@ def _push_recipients(new_message, sender_user, conversation, parsed_conv):
     # too noisy on mobile. Filter by checking the message body for each
     # mentioned user's literal @username.
     content = new_message.content or ""
-    direct_mention_pattern = r"(?<![^\s(\['\"])@(\w+)"
-    direct_usernames = {m.lower() for m in re.findall(direct_mention_pattern, content)}
+    direct_usernames = {m.lower() for m in _MENTION_RE.findall(content)}
     direct_usernames -= {"channel", "here"}
 
     if direct_usernames:
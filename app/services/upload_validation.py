@@ -62,6 +62,11 @@ ALLOWED_EXTENSIONS: frozenset[str] = (
 # ALLOWED_EXTENSIONS here.
 AVATAR_EXTENSIONS: frozenset[str] = frozenset({"png", "jpg", "jpeg", "gif"})
 
+# Extensions whose bytes the upload pipeline may shrink by re-encoding through
+# Pillow. Everything else is stored as received, so its size is final the
+# moment the request body arrives.
+REENCODED_EXTENSIONS: frozenset[str] = frozenset({"png", "jpg", "jpeg"})
+
 
 class ValidationError(Exception):
     """Raised when an uploaded file fails server-side content validation."""
@@ -80,6 +85,21 @@ def _extract_extension(filename: str) -> str | None:
     return filename.rsplit(".", 1)[1].lower()
 
 
+def stream_size(file_storage) -> int:
+    """
+    Return the byte length of an incoming upload without reading it.
+
+    Werkzeug spools multipart parts to a seekable file, so seeking to the end
+    is enough; the stream is rewound afterwards so ``save()`` still copies
+    every byte.
+    """
+    stream = file_storage.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
 def _sniff_mime(file_path: str) -> str:
     """Wrap ``magic.from_file`` so we can stub it in tests if needed."""
     return magic.from_file(file_path, mime=True)
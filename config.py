@@ -132,6 +132,11 @@ class TestConfig(Config):
     TESTING = True
     # Use an in-memory SQLite database for tests to keep them fast and isolated
     DATABASE_URI = "sqlite:///:memory:"
+    # These only matter if DATABASE_URI above is pointed at a file-backed
+    # database, e.g. to inspect a failing run; on :memory: they change nothing.
+    # Leave journal_mode alone: OFF would break the ROLLBACK TO SAVEPOINT that
+    # isolates each test.
+    DATABASE_PRAGMAS = {"temp_store": "memory", "synchronous": 0}
     # Disable CSRF protection in testing forms
     WTF_CSRF_ENABLED = False
     # Use a dummy secret key for tests (must be ≥32 chars per the validator)
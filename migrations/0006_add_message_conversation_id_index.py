@@ -0,0 +1,32 @@
+"""0006_add_message_conversation_id_index.py
+
+Adds a composite ``(conversation_id, id)`` index to the ``message`` table.
+
+Message history is paged with a keyset cursor (``WHERE conversation_id = ?
+AND id < ? ORDER BY id DESC LIMIT n``). The single-column foreign-key index
+on ``conversation_id`` finds the rows but still has to sort them; the
+composite index hands them back already ordered, so a page costs the same
+however far back the user scrolls.
+
+Existing prod DBs need ``./smalls.py migrate`` (or ``auto migrate d8-chat``).
+Fresh DBs initialized via ``init_db.py`` already have the index because the
+``Message`` model declares it in ``Meta.indexes``; the ``IF NOT EXISTS`` guard
+makes this migration a no-op there.
+"""
+
+# pylint: disable=C0103
+
+from db_bootstrap import db
+
+
+def migrate():
+    """Create the (conversation_id, id) index on message."""
+    db.execute_sql(
+        "CREATE INDEX IF NOT EXISTS message_conversation_id_id "
+        'ON "message" (conversation_id, id)'
+    )
+
+
+def rollback():
+    """Drop the (conversation_id, id) index."""
+    db.execute_sql("DROP INDEX IF EXISTS message_conversation_id_id")
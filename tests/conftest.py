@@ -1,11 +1,13 @@
 # tests/conftest.py
 
+import io
 import os
+from types import SimpleNamespace
 
 os.environ["PYTEST_CURRENT_TEST"] = "true"
 os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-chars-long")
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -52,12 +54,75 @@ def mock_redis(mocker):
     chat_manager.pubsub = None
 
 
-@pytest.fixture(scope="function")
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Enforces `@pytest.mark.max_queries(n)`: fails the test if its body (not
+    its fixtures) sends more than `n` SQL statements to the database. Guards
+    hot paths against silently regressing into per-row queries.
+    """
+    marker = item.get_closest_marker("max_queries")
+    if marker is None:
+        return (yield)
+
+    limit = marker.args[0]
+    database = db.obj
+    executed = []
+    execute_sql = database.execute_sql
+
+    def counting_execute_sql(sql, *args, **kwargs):
+        executed.append(sql)
+        return execute_sql(sql, *args, **kwargs)
+
+    database.execute_sql = counting_execute_sql
+    try:
+        result = yield
+    finally:
+        del database.execute_sql
+
+    if len(executed) > limit:
+        pytest.fail(
+            f"{len(executed)} queries executed, expected at most {limit}:\n"
+            + "\n".join(executed)
+        )
+    return result
+
+
+# Every model the test schema needs, in dependency order.
+TEST_TABLES = [
+    User,
+    Workspace,
+    WorkspaceMember,
+    Conversation,
+    Channel,
+    ChannelMember,
+    Message,
+    UserConversationStatus,
+    Mention,
+    Reaction,
+    UploadedFile,
+    MessageAttachment,
+    Hashtag,
+    MessageHashtag,
+    Poll,
+    PollOption,
+    Vote,
+    AuditLog,
+    DeviceToken,
+]
+
+
+@pytest.fixture(scope="session")
 def app():
     """
-    Creates a single Flask app instance for the entire test session.
+    Creates a single Flask app instance for the whole test session.
+
+    Session-scoped fixtures run before the function-scoped `mock_redis`, so
+    Redis is patched here as well to keep `chat_manager.initialize()` from
+    dialing a real Valkey while the app is built.
     """
-    app = create_app(config_class="config.TestConfig")
+    with patch("redis.from_url", return_value=Mock()):
+        app = create_app(config_class="config.TestConfig")
     return app
 
 
@@ -71,38 +136,15 @@ def client(app):
         yield client
 
 
-@pytest.fixture(scope="function", autouse=True)
-def test_db(app):
+@pytest.fixture(scope="session")
+def schema(app):
     """
-    This special fixture automatically runs for every test function.
-    It initializes the database, creates all tables, seeds essential data,
-    and then cleans everything up after the test is done.
+    Creates the schema and seeds the essential rows once per test session.
+    Nothing commits on top of it: `database` and `test_db` roll back
+    everything written after this point.
     """
     with app.app_context():
-        # A list of all your models
-        tables = [
-            User,
-            Workspace,
-            WorkspaceMember,
-            Conversation,
-            Channel,
-            ChannelMember,
-            Message,
-            UserConversationStatus,
-            Mention,
-            Reaction,
-            UploadedFile,
-            MessageAttachment,
-            Hashtag,
-            MessageHashtag,
-            Poll,
-            PollOption,
-            Vote,
-            AuditLog,
-            DeviceToken,
-        ]
-
-        db.create_tables(tables)
+        db.create_tables(TEST_TABLES)
 
         # Seed the database with one essential user and workspace
         workspace, _ = Workspace.get_or_create(name="DevOcho")
@@ -128,11 +170,69 @@ def test_db(app):
             defaults={"type": "channel"},
         )
 
-        yield  # The test runs at this point
+        yield db
 
-        # Teardown: drop all tables to ensure isolation
+        # Teardown: closing the in-memory connection discards the database.
+        db.drop_tables(TEST_TABLES)
         db.close()
-        db.drop_tables(tables)
+
+
+@pytest.fixture(scope="session")
+def baseline(schema):
+    """
+    The seeded rows, fetched once per session: the default user and the
+    "DevOcho" workspace everyone belongs to. Fixtures and tests may use these
+    directly as foreign keys; tests that read or modify the seeded user should
+    take the `user1` fixture, which puts the instance back afterwards.
+    """
+    return SimpleNamespace(
+        user1=User.get_by_id(1),
+        workspace=Workspace.get(Workspace.name == "DevOcho"),
+    )
+
+
+@pytest.fixture(scope="module")
+def database(app, schema):
+    """
+    Opens a transaction that spans one test module, on top of the seeded
+    session schema.
+
+    Module-scoped setup fixtures should depend on this. Their rows are shared
+    by every test in the module and rolled back when the module finishes, so
+    they never leak into the next file.
+    """
+    with app.app_context(), schema.atomic() as txn:
+        yield schema
+        txn.rollback()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def test_db(app, database):
+    """
+    This special fixture automatically runs for every test function.
+    It wraps the test in a savepoint inside the module's transaction and
+    rolls it back afterwards, so each test sees the seeded database without
+    paying for a rebuild. Code under test that opens its own `db.atomic()`
+    gets a nested savepoint.
+    """
+    with app.app_context(), database.atomic() as savepoint:
+        yield database
+        savepoint.rollback()
+
+
+@pytest.fixture(scope="function")
+def user1(test_db, baseline):
+    """
+    The seeded user (id=1), served from the session's cached row instead of
+    another SELECT. A test may modify and save it: the write is rolled back
+    with the test's savepoint, and the instance's fields are restored here so
+    the next test starts from the seeded values again. No module fixture
+    writes to this row, so the cached values always match the database.
+    """
+    user = baseline.user1
+    seeded = dict(user.__data__)
+    yield user
+    user.__data__ = seeded
 
 
 @pytest.fixture(scope="function")
@@ -144,3 +244,38 @@ def logged_in_client(client):
     with client.session_transaction() as sess:
         sess["user_id"] = 1
     yield client
+
+
+@pytest.fixture(scope="function")
+def logged_in_client_as(app):
+    """
+    A factory fixture: `logged_in_client_as(user_id)` returns a new test
+    client that is already logged in as that user. Use it instead of
+    rewriting `user_id` on `logged_in_client`'s session mid-test.
+    """
+
+    def _make_client(user_id):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["user_id"] = user_id
+        return client
+
+    return _make_client
+
+
+@pytest.fixture(scope="function")
+def make_upload():
+    """
+    A factory for multipart upload payloads: `make_upload(data, name)` returns
+    the `{"file": ...}` form dict the test client expects. Each call wraps the
+    bytes in a fresh stream, since the client consumes it. Pass `content_type`
+    to set the part's own Content-Type header.
+    """
+
+    def _make_upload(data=b"", name="test.txt", content_type=None):
+        part = (io.BytesIO(data), name)
+        if content_type is not None:
+            part += (content_type,)
+        return {"file": part}
+
+    return _make_upload
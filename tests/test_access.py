@@ -30,39 +30,35 @@ def _make_extra_channel(name: str) -> Channel:
 
 
 class TestChannelAccess:
-    def test_member_has_access(self, app):
+    def test_member_has_access(self, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             channel = _make_extra_channel("project-alpha")
-            ChannelMember.create(user=user, channel=channel)
+            ChannelMember.create(user=user1, channel=channel)
             parsed = parse_conversation_id(f"channel_{channel.id}")
-            assert user_has_conversation_access(user, parsed) is True
+            assert user_has_conversation_access(user1, parsed) is True
 
-    def test_non_member_denied(self, app):
+    def test_non_member_denied(self, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             channel = _make_extra_channel("project-bravo")
             # No ChannelMember row created.
             parsed = parse_conversation_id(f"channel_{channel.id}")
-            assert user_has_conversation_access(user, parsed) is False
+            assert user_has_conversation_access(user1, parsed) is False
 
-    def test_membership_for_other_channel_doesnt_grant(self, app):
+    def test_membership_for_other_channel_doesnt_grant(self, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             allowed = _make_extra_channel("allowed")
             other = _make_extra_channel("other")
-            ChannelMember.create(user=user, channel=allowed)
+            ChannelMember.create(user=user1, channel=allowed)
             parsed = parse_conversation_id(f"channel_{other.id}")
-            assert user_has_conversation_access(user, parsed) is False
+            assert user_has_conversation_access(user1, parsed) is False
 
 
 class TestDmAccess:
-    def test_participant_has_access(self, app):
+    def test_participant_has_access(self, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             other = _make_extra_user("alice_dm")
-            parsed = parse_conversation_id(f"dm_{user.id}_{other.id}")
-            assert user_has_conversation_access(user, parsed) is True
+            parsed = parse_conversation_id(f"dm_{user1.id}_{other.id}")
+            assert user_has_conversation_access(user1, parsed) is True
 
     def test_outsider_denied(self, app):
         with app.app_context():
@@ -72,11 +68,10 @@ class TestDmAccess:
             parsed = parse_conversation_id(f"dm_{a.id}_{b.id}")
             assert user_has_conversation_access(outsider, parsed) is False
 
-    def test_self_dm(self, app):
+    def test_self_dm(self, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
-            parsed = parse_conversation_id(f"dm_{user.id}_{user.id}")
-            assert user_has_conversation_access(user, parsed) is True
+            parsed = parse_conversation_id(f"dm_{user1.id}_{user1.id}")
+            assert user_has_conversation_access(user1, parsed) is True
 
 
 class TestEdgeCases:
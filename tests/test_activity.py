@@ -13,9 +13,8 @@ from app.models import (
 
 
 @pytest.fixture
-def setup_threads(test_db):
+def setup_threads(test_db, user1):
     """Sets up a user, a channel, and a threaded conversation for testing."""
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="user_two", email="two@example.com")
     channel = Channel.get(name="general")
     ChannelMember.create(user=user2, channel=channel)
@@ -74,14 +73,13 @@ def test_view_all_threads_marks_as_read(logged_in_client, setup_threads):
     assert b"2 replies" in response.data
 
 
-def test_view_all_unreads_clears_badges(logged_in_client):
+def test_view_all_unreads_clears_badges(logged_in_client, user1):
     """
     GIVEN a user with an unread DM
     WHEN they view the /chat/unreads page
     THEN the response should contain the unread message AND OOB swaps to clear the badges.
     """
     # Arrange
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="dm_sender", email="sender@example.com")
     conv, _ = Conversation.get_or_create(
         conversation_id_str=f"dm_{user1.id}_{user2.id}", type="dm"
@@ -6,13 +6,12 @@ from app.models import (
     ChannelMember,
     DeviceToken,
     User,
-    Workspace,
     WorkspaceMember,
 )
 
 
 @pytest.fixture
-def admin_client(client, test_db):
+def admin_client(client, test_db, baseline):
     """Creates an admin user and returns a logged-in client for them."""
     admin_user = User.create(
         username="superadmin", email="admin@test.com", display_name="Super Admin"
@@ -20,7 +19,7 @@ def admin_client(client, test_db):
     admin_user.set_password("password")
     admin_user.save()
 
-    workspace = Workspace.get(name="DevOcho")
+    workspace = baseline.workspace
     WorkspaceMember.create(user=admin_user, workspace=workspace, role="admin")
 
     with client.session_transaction() as sess:
@@ -80,17 +79,16 @@ def test_admin_create_user(admin_client):
     assert new_user.email == "new@admin.com"
 
 
-def test_admin_edit_user(admin_client):
+def test_admin_edit_user(admin_client, user1):
     """Test editing an existing user via the admin panel."""
-    user_to_edit = User.get_by_id(1)  # testuser
 
     # 1. Test GET
-    res_get = admin_client.get(f"/admin/users/edit/{user_to_edit.id}")
+    res_get = admin_client.get(f"/admin/users/edit/{user1.id}")
     assert res_get.status_code == 200
 
     # 2. Test POST
     res_post = admin_client.post(
-        f"/admin/users/edit/{user_to_edit.id}",
+        f"/admin/users/edit/{user1.id}",
         data={
             "username": "edited_testuser",
             "email": "edited@test.com",
@@ -106,13 +104,12 @@ def test_admin_edit_user(admin_client):
     assert updated_user.email == "edited@test.com"
 
 
-def test_admin_deactivate_user(admin_client):
+def test_admin_deactivate_user(admin_client, user1):
     """Deactivating a user flips is_active, blocks auth, and clears push tokens."""
-    user = User.get_by_id(1)  # testuser (a member, seeded by conftest)
-    assert user.is_active is True
-    DeviceToken.create(user=user, token="fcm-token-abc", platform="android")
+    assert user1.is_active is True
+    DeviceToken.create(user=user1, token="fcm-token-abc", platform="android")
 
-    res = admin_client.post(f"/admin/users/{user.id}/deactivate")
+    res = admin_client.post(f"/admin/users/{user1.id}/deactivate")
     assert res.status_code == 200
     assert b"has been deactivated" in res.data
 
@@ -121,16 +118,15 @@ def test_admin_deactivate_user(admin_client):
     # Canonical auth gate now refuses the account everywhere.
     assert User.get_active_by_id(1) is None
     # Push device tokens were purged so a departed device stops getting pushes.
-    assert DeviceToken.select().where(DeviceToken.user == user).count() == 0
+    assert DeviceToken.select().where(DeviceToken.user == user1).count() == 0
 
 
-def test_admin_reactivate_user(admin_client):
+def test_admin_reactivate_user(admin_client, user1):
     """A deactivated user can be restored to active."""
-    user = User.get_by_id(1)
-    user.is_active = False
-    user.save()
+    user1.is_active = False
+    user1.save()
 
-    res = admin_client.post(f"/admin/users/{user.id}/reactivate")
+    res = admin_client.post(f"/admin/users/{user1.id}/reactivate")
     assert res.status_code == 200
     assert b"has been reactivated" in res.data
 
@@ -240,11 +236,11 @@ def test_admin_edit_channel(admin_client):
     assert updated_channel.topic == "Updated general topic"
 
 
-def test_admin_manage_channel_members(admin_client):
+def test_admin_manage_channel_members(admin_client, baseline):
     """Test adding, changing role, and removing channel members via admin."""
     channel = Channel.get(name="general")
     user = User.create(username="chan_user", email="cu@t.com")
-    workspace = Workspace.get(name="DevOcho")
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user, workspace=workspace, role="member")
 
     # 1. Add Member
@@ -12,7 +12,6 @@ import time
 import pytest
 
 from app.blueprints.api_v1 import generate_api_token, verify_api_token
-from app.models import User
 
 
 @pytest.fixture
@@ -107,11 +106,10 @@ class TestBearerPrefixHandling:
     """The ``d8_sec_`` prefix is part of the wire format mobile clients use.
     The decorator strips it before verifying."""
 
-    def test_prefix_accepted(self, client, app):
+    def test_prefix_accepted(self, client, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
-            user.set_password("password123")
-            user.save()
+            user1.set_password("password123")
+            user1.save()
 
         login = client.post(
             "/api/v1/auth/login",
@@ -124,11 +122,10 @@ class TestBearerPrefixHandling:
         ok = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
         assert ok.status_code == 200
 
-    def test_unprefixed_token_also_accepted(self, client, app):
+    def test_unprefixed_token_also_accepted(self, client, app, user1):
         with app.app_context():
-            user = User.get_by_id(1)
-            user.set_password("password123")
-            user.save()
+            user1.set_password("password123")
+            user1.save()
 
         login = client.post(
             "/api/v1/auth/login",
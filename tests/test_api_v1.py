@@ -1,6 +1,5 @@
 # tests/test_api_v1.py
 import datetime
-import io
 
 from app.models import (
     Conversation,
@@ -11,16 +10,15 @@ from app.models import (
 )
 
 
-def test_api_login_success(client):
+def test_api_login_success(client, user1):
     """
     GIVEN a user with a known password
     WHEN the API login endpoint is called with valid credentials
     THEN it should return a 200 response with an api_token and user data
     """
     # The 'testuser' (id=1) is created by conftest.py, but lacks a password. Let's set one.
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     response = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -47,15 +45,14 @@ def test_api_login_failure(client):
     assert response.get_json()["error"] == "Invalid credentials"
 
 
-def test_api_get_me_success(client):
+def test_api_get_me_success(client, user1):
     """
     GIVEN a valid api_token
     WHEN the /api/v1/auth/me endpoint is called with the token in the Authorization header
     THEN it should return the authenticated user's details
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     # Login to get the token
     login_res = client.post(
@@ -81,15 +78,14 @@ def test_api_get_me_unauthorized(client):
     assert response.get_json()["error"] == "Missing or invalid token"
 
 
-def test_api_get_workspaces_success(client):
+def test_api_get_workspaces_success(client, user1):
     """
     GIVEN a valid api_token
     WHEN the /api/v1/workspaces endpoint is called
     THEN it should return a list of workspaces the user is in
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -105,7 +101,7 @@ def test_api_get_workspaces_success(client):
     assert data["workspaces"][0]["name"] == "DevOcho"  # Default from conftest
 
 
-def test_api_get_channels_success(client):
+def test_api_get_channels_success(client, user1):
     """
     GIVEN a valid api_token
     WHEN the /api/v1/channels endpoint is called
@@ -113,13 +109,12 @@ def test_api_get_channels_success(client):
     """
     from app.models import Channel, ChannelMember
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     # Explicitly add the testuser to the general channel so the list isn't empty
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -139,15 +134,14 @@ def test_api_get_channels_success(client):
     assert "mention_count" in first_channel
 
 
-def test_api_get_dms_success(client):
+def test_api_get_dms_success(client, user1):
     """
     GIVEN a valid api_token
     WHEN the /api/v1/dms endpoint is called
     THEN it should return the active DMs for the user
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -192,10 +186,10 @@ def _make_dm(me, partner_id, last_msg_age_days, unread):
     return conv
 
 
-def test_api_get_dms_matches_web_filtering(client):
+def test_api_get_dms_matches_web_filtering(client, user1):
     """GET /api/v1/dms mirrors the web sidebar: recent-or-unread DMs only, and
     never the user themselves. Guards the mobile/web list drift."""
-    me = User.get_by_id(1)
+    me = user1
     recent = User.create(id=2, username="recent", email="r@x.com")
     stale = User.create(id=3, username="stale", email="s@x.com")
     stale_unread = User.create(id=4, username="staleunread", email="su@x.com")
@@ -325,7 +319,7 @@ def test_api_create_dm_invalid_user_id(client):
         assert res.status_code == 400, payload
 
 
-def test_api_get_messages_success(client):
+def test_api_get_messages_success(client, user1):
     """
     GIVEN a valid api_token and a conversation with messages
     WHEN the /api/v1/conversations/<conv_id>/messages endpoint is called
@@ -333,15 +327,14 @@ def test_api_get_messages_success(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Message
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     # Ensure user is in the channel and create a test message
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
-    Message.create(user=user, conversation=conv, content="API Test Message")
+    Message.create(user=user1, conversation=conv, content="API Test Message")
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -363,7 +356,7 @@ def test_api_get_messages_success(client):
     assert "attachments" in data["messages"][-1]
 
 
-def test_api_get_thread_success(client):
+def test_api_get_thread_success(client, user1):
     """
     GIVEN a parent message with thread replies
     WHEN the /api/v1/threads/<msg_id> endpoint is called
@@ -371,21 +364,19 @@ def test_api_get_thread_success(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Message
 
-    user = User.get_by_id(1)
-
     # We need to set the password so the login works!
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
     parent = Message.create(
-        user=user, conversation=conv, content="Parent Thread Message"
+        user=user1, conversation=conv, content="Parent Thread Message"
     )
     Message.create(
-        user=user,
+        user=user1,
         conversation=conv,
         content="Thread Reply",
         parent_message=parent,
@@ -411,7 +402,7 @@ def test_api_get_thread_success(client):
     assert data["replies"][0]["content"] == "Thread Reply"
 
 
-def test_api_create_message_success_channel(client):
+def test_api_create_message_success_channel(client, user1):
     """
     GIVEN a valid api_token and a conversation the user is in
     WHEN a POST request is made to create a message
@@ -419,13 +410,12 @@ def test_api_create_message_success_channel(client):
     """
     from app.models import Channel, ChannelMember, Conversation
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     # Add user to general channel
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
     login_res = client.post(
@@ -447,7 +437,7 @@ def test_api_create_message_success_channel(client):
     assert data["conversation_id_str"] == conv.conversation_id_str
 
 
-def test_api_create_message_thread_reply(client):
+def test_api_create_message_thread_reply(client, user1):
     """
     GIVEN a valid api_token and a parent message
     WHEN a POST request is made to create a thread reply
@@ -455,15 +445,14 @@ def test_api_create_message_thread_reply(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Message
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
-    parent_msg = Message.create(user=user, conversation=conv, content="Parent")
+    parent_msg = Message.create(user=user1, conversation=conv, content="Parent")
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -488,19 +477,18 @@ def test_api_create_message_thread_reply(client):
     assert data["parent_message_id"] == parent_msg.id
 
 
-def test_api_create_message_missing_content(client):
+def test_api_create_message_missing_content(client, user1):
     """
     WHEN POSTing without content
     THEN return 400 Bad Request
     """
     from app.models import Channel, ChannelMember, Conversation
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
     login_res = client.post(
@@ -519,7 +507,7 @@ def test_api_create_message_missing_content(client):
     assert res.get_json()["error"] == "Message content is required"
 
 
-def test_api_create_message_access_denied(client):
+def test_api_create_message_access_denied(client, user1):
     """
     GIVEN a valid api_token but a conversation the user is NOT in
     WHEN a POST request is made
@@ -527,9 +515,8 @@ def test_api_create_message_access_denied(client):
     """
     from app.models import Channel, Conversation
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     # Create a private channel but DO NOT add the user to it
     channel = Channel.create(workspace_id=1, name="secret-api-channel", is_private=True)
@@ -553,15 +540,14 @@ def test_api_create_message_access_denied(client):
     assert res.get_json()["error"] == "Access denied"
 
 
-def test_api_upload_file_success(client, mocker):
+def test_api_upload_file_success(client, mocker, user1, make_upload):
     """
     GIVEN a valid api_token
     WHEN a valid file is posted to /api/v1/files/upload
     THEN it should upload the file and return a 201 with file details
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -578,7 +564,7 @@ def test_api_upload_file_success(client, mocker):
         b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01"
         b"\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
     )
-    file_data = {"file": (io.BytesIO(tiny_png), "test_image.png")}
+    file_data = make_upload(tiny_png, "test_image.png")
 
     res = client.post(
         "/api/v1/files/upload",
@@ -596,15 +582,14 @@ def test_api_upload_file_success(client, mocker):
     assert "url" in data
 
 
-def test_api_upload_file_too_large(client, mocker):
+def test_api_upload_file_too_large(client, mocker, user1, make_upload):
     """
     Files larger than MAX_CONTENT_LENGTH are rejected before they reach
     Minio. The test forces the limit down to a few bytes so we don't have
     to upload 50MB of fake content.
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
     )
@@ -624,7 +609,7 @@ def test_api_upload_file_too_large(client, mocker):
 
     res = client.post(
         "/api/v1/files/upload",
-        data={"file": (io.BytesIO(tiny_png), "big.png")},
+        data=make_upload(tiny_png, "big.png"),
         content_type="multipart/form-data",
         headers={"Authorization": f"Bearer {token}"},
     )
@@ -634,14 +619,13 @@ def test_api_upload_file_too_large(client, mocker):
     upload_mock.assert_not_called()
 
 
-def test_api_upload_file_missing_file(client):
+def test_api_upload_file_missing_file(client, user1):
     """
     WHEN POSTing to the upload endpoint without a file part
     THEN it should return 400 Bad Request
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -659,7 +643,7 @@ def test_api_upload_file_missing_file(client):
     assert res.get_json()["error"] == "No file part"
 
 
-def test_api_get_file_content_success(client, mocker):
+def test_api_get_file_content_success(client, mocker, user1):
     """
     GIVEN a valid api_token and an existing file
     WHEN a GET request is made to /api/v1/files/<file_id>/content
@@ -667,9 +651,8 @@ def test_api_get_file_content_success(client, mocker):
     """
     from app.models import UploadedFile
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -677,7 +660,7 @@ def test_api_get_file_content_success(client, mocker):
     token = login_res.get_json()["api_token"]
 
     dummy_file = UploadedFile.create(
-        uploader=user,
+        uploader=user1,
         original_filename="test.txt",
         stored_filename="dummy-uuid.txt",
         mime_type="text/plain",
@@ -710,14 +693,13 @@ def test_api_get_file_content_success(client, mocker):
     mock_response.release_conn.assert_called_once()
 
 
-def test_api_get_file_content_not_found(client):
+def test_api_get_file_content_not_found(client, user1):
     """
     WHEN requesting a file that doesn't exist
     THEN return 404 Not Found
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -732,7 +714,7 @@ def test_api_get_file_content_not_found(client):
     assert res.get_json()["error"] == "File not found"
 
 
-def test_api_get_conversation_members(client):
+def test_api_get_conversation_members(client, user1):
     """
     GIVEN a valid token and a conversation ID
     WHEN a GET request is made to the members endpoint
@@ -740,12 +722,11 @@ def test_api_get_conversation_members(client):
     """
     from app.models import Channel, ChannelMember, Conversation
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
     login_res = client.post(
@@ -764,7 +745,7 @@ def test_api_get_conversation_members(client):
     assert any(member["username"] == "testuser" for member in data["members"])
 
 
-def test_api_create_poll_and_vote(client):
+def test_api_create_poll_and_vote(client, user1):
     """
     GIVEN a valid token
     WHEN a poll is created and voted on via the API
@@ -772,12 +753,11 @@ def test_api_create_poll_and_vote(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Vote
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
     login_res = client.post(
@@ -817,7 +797,7 @@ def test_api_create_poll_and_vote(client):
     assert Vote.select().count() == 1
 
 
-def test_api_search_success(client):
+def test_api_search_success(client, user1):
     """
     GIVEN a valid query
     WHEN the search API is called
@@ -825,14 +805,15 @@ def test_api_search_success(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Message
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
-    Message.create(user=user, conversation=conv, content="Searching for Apollo keyword")
+    Message.create(
+        user=user1, conversation=conv, content="Searching for Apollo keyword"
+    )
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -854,7 +835,7 @@ def test_api_search_success(client):
     assert "people" in data
 
 
-def test_api_get_messages_around_id(client):
+def test_api_get_messages_around_id(client, user1):
     """
     GIVEN a conversation with multiple messages
     WHEN calling get_messages with around_message_id
@@ -862,17 +843,16 @@ def test_api_get_messages_around_id(client):
     """
     from app.models import Channel, ChannelMember, Conversation, Message
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
-    Message.create(user=user, conversation=conv, content="First")
-    msg2 = Message.create(user=user, conversation=conv, content="Target")
-    Message.create(user=user, conversation=conv, content="Last")
+    Message.create(user=user1, conversation=conv, content="First")
+    msg2 = Message.create(user=user1, conversation=conv, content="Target")
+    Message.create(user=user1, conversation=conv, content="Last")
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -968,15 +948,14 @@ def test_api_sso_exchange_success(client, mocker):
     assert data["user"]["display_name"] == "Mobile User"
 
 
-def test_api_update_me(client):
+def test_api_update_me(client, user1):
     """
     GIVEN a valid token
     WHEN a PATCH is made to /api/v1/users/me
     THEN it updates the user's details
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -996,34 +975,7 @@ def test_api_update_me(client):
     assert updated_user.display_name == "Updated Name From API"
 
 
-def test_rate_limit_returns_json(app):
-    """
-    GIVEN rate limiting is enabled
-    WHEN a client exceeds the login rate limit
-    THEN the 429 response should be JSON, not HTML
-    """
-    from app import limiter
-
-    app.config["RATELIMIT_ENABLED"] = True
-    app.config["RATELIMIT_STORAGE_URI"] = "memory://"
-    limiter.init_app(app)
-
-    with app.test_client() as client:
-        for _ in range(10):
-            client.post("/api/v1/auth/login", json={"username": "x", "password": "y"})
-
-        res = client.post("/api/v1/auth/login", json={"username": "x", "password": "y"})
-
-    app.config["RATELIMIT_ENABLED"] = False
-
-    assert res.status_code == 429
-    data = res.get_json()
-    assert data is not None, "429 response must be JSON, not HTML"
-    assert data["error"] == "Rate limit exceeded"
-    assert "detail" in data
-
-
-def test_api_mark_conversation_read(client, mocker):
+def test_api_mark_conversation_read(client, mocker, user1):
     """
     GIVEN a valid token and a conversation with unread messages
     WHEN POST /api/v1/conversations/<conv_id>/read is called
@@ -1037,14 +989,13 @@ def test_api_mark_conversation_read(client, mocker):
         UserConversationStatus,
     )
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.get(Channel.name == "general")
-    ChannelMember.get_or_create(user=user, channel=channel)
+    ChannelMember.get_or_create(user=user1, channel=channel)
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
-    Message.create(user=user, conversation=conv, content="Unread message")
+    Message.create(user=user1, conversation=conv, content="Unread message")
 
     mock_send = mocker.patch("app.chat_manager.chat_manager.send_to_user")
 
@@ -1061,12 +1012,12 @@ def test_api_mark_conversation_read(client, mocker):
     assert res.status_code == 204
     assert res.data == b""
 
-    status = UserConversationStatus.get(user=user, conversation=conv)
+    status = UserConversationStatus.get(user=user1, conversation=conv)
     assert status.last_read_timestamp is not None
 
     mock_send.assert_called_once()
     call_args = mock_send.call_args
-    assert call_args[0][0] == user.id
+    assert call_args[0][0] == user1.id
     api_data = call_args[0][1]["api_data"]
     assert api_data["type"] == "unread_updated"
     assert api_data["data"]["conversation_id_str"] == conv.conversation_id_str
@@ -1074,7 +1025,7 @@ def test_api_mark_conversation_read(client, mocker):
     assert api_data["data"]["is_mention"] is False
 
 
-def test_api_mark_conversation_read_non_member(client):
+def test_api_mark_conversation_read_non_member(client, user1):
     """
     GIVEN a valid token but a channel the user is NOT in
     WHEN POST /api/v1/conversations/<conv_id>/read is called
@@ -1082,9 +1033,8 @@ def test_api_mark_conversation_read_non_member(client):
     """
     from app.models import Channel, Conversation
 
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     channel = Channel.create(workspace_id=1, name="private-read-test", is_private=True)
     conv, _ = Conversation.get_or_create(
@@ -1104,15 +1054,14 @@ def test_api_mark_conversation_read_non_member(client):
     assert res.status_code == 403
 
 
-def test_api_update_presence(client):
+def test_api_update_presence(client, user1):
     """
     GIVEN a valid token
     WHEN a POST is made to /api/v1/users/me/presence
     THEN it updates the user's presence status
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
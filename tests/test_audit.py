@@ -16,18 +16,16 @@ from app.models import (
     Channel,
     ChannelMember,
     User,
-    Workspace,
     WorkspaceMember,
 )
 
 
 @pytest.fixture
-def admin_client(client, app):
+def admin_client(client, app, user1, baseline):
     """Return a client logged in as an admin user."""
     with app.app_context():
-        user = User.get_by_id(1)
-        workspace = Workspace.get(Workspace.name == "DevOcho")
-        member, _ = WorkspaceMember.get_or_create(user=user, workspace=workspace)
+        workspace = baseline.workspace
+        member, _ = WorkspaceMember.get_or_create(user=user1, workspace=workspace)
         member.role = "admin"
         member.save()
     with client.session_transaction() as sess:
@@ -39,21 +37,20 @@ def admin_client(client, app):
 
 
 class TestAuditHelper:
-    def test_writes_basic_event(self, app):
+    def test_writes_basic_event(self, app, user1):
         with app.test_request_context("/"):
             from flask import g
 
-            g.user = User.get_by_id(1)
+            g.user = user1
             audit("test.event")
         row = AuditLog.get(AuditLog.action == "test.event")
         assert row.actor_id == 1
         assert row.target_type is None
         assert row.target_id is None
 
-    def test_target_model_extracts_type_and_id(self, app):
+    def test_target_model_extracts_type_and_id(self, app, user1):
         with app.test_request_context("/"):
-            user = User.get_by_id(1)
-            audit("test.target", target=user)
+            audit("test.target", target=user1)
         row = AuditLog.get(AuditLog.action == "test.target")
         assert row.target_type == "user"
         assert row.target_id == 1
@@ -118,12 +115,12 @@ class TestAdminRoutesEmitAudit:
         details = json.loads(row.details)
         assert details["name"] == "audit-test"
 
-    def test_role_change_records_before_and_after(self, admin_client, app):
+    def test_role_change_records_before_and_after(self, admin_client, app, baseline):
         with app.app_context():
             other = User.create(
                 username="othermember", email="other@example.com", display_name="O"
             )
-            workspace = Workspace.get(Workspace.name == "DevOcho")
+            workspace = baseline.workspace
             WorkspaceMember.create(user=other, workspace=workspace, role="member")
             channel = Channel.create(workspace=workspace, name="role-test")
             ChannelMember.create(user=other, channel=channel, role="member")
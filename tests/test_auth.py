@@ -1,7 +1,5 @@
 # tests/test_auth.py
 
-from app.models import User
-
 
 def test_login_redirect(client):
     """
@@ -56,15 +54,14 @@ def test_logout_rejects_get(logged_in_client):
     assert response.status_code != 302
 
 
-def test_login_success(client):
+def test_login_success(client, user1):
     """
     GIVEN a user with a known password
     WHEN they post to /login with valid credentials
     THEN they should be logged in and redirected to /chat
     """
-    user = User.get_by_id(1)
-    user.set_password("mypassword")
-    user.save()
+    user1.set_password("mypassword")
+    user1.save()
 
     response = client.post(
         "/login", data={"username": "testuser", "password": "mypassword"}
@@ -13,21 +13,20 @@ from app.models import (
     Conversation,
     Message,
     User,
-    Workspace,
     WorkspaceMember,
 )
 
 
 @pytest.fixture
-def channel_with_messages(app):
+def channel_with_messages(app, baseline, user1):
     """A channel the default user is in, seeded with 3 messages."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="catchup-chan")
         conv, _ = Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
         )
-        ChannelMember.create(user=User.get_by_id(1), channel=channel)
+        ChannelMember.create(user=user1, channel=channel)
         author = User.create(username="catchup-author", email="ca@example.com")
         WorkspaceMember.create(user=author, workspace=workspace)
         msgs = [
@@ -59,9 +58,9 @@ def test_since_zero_returns_all(logged_in_client, channel_with_messages):
     assert "hx-swap-oob" in body
 
 
-def test_since_denies_non_member(logged_in_client, app):
+def test_since_denies_non_member(logged_in_client, app, baseline):
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="catchup-forbidden")
         conv, _ = Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
@@ -76,16 +75,16 @@ def test_since_unknown_conversation_404(logged_in_client):
     assert res.status_code == 404
 
 
-def test_since_truncation_header(logged_in_client, app, mocker):
+def test_since_truncation_header(logged_in_client, app, mocker, baseline, user1):
     # Force a tiny cap so we can assert the truncated header cheaply.
     mocker.patch("app.routes.CATCHUP_LIMIT", 2)
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="catchup-trunc")
         conv, _ = Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
         )
-        ChannelMember.create(user=User.get_by_id(1), channel=channel)
+        ChannelMember.create(user=user1, channel=channel)
         author = User.create(username="trunc-author", email="ta@example.com")
         WorkspaceMember.create(user=author, workspace=workspace)
         for i in range(5):
@@ -5,12 +5,11 @@ from app.models import Channel, ChannelMember, Conversation, User, WorkspaceMemb
 
 
 @pytest.fixture
-def setup_channel_with_admin_and_member(test_db):
+def setup_channel_with_admin_and_member(test_db, user1, baseline):
     """A fixture that creates a channel with an admin (user1) and a member (user2)."""
-    user1 = User.get_by_id(1)  # This is our default logged-in user, the admin
     user2 = User.create(id=2, username="regular_member", email="member@example.com")
 
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
 
     channel = Channel.create(workspace=workspace, name="test-managed-channel")
@@ -21,11 +20,10 @@ def setup_channel_with_admin_and_member(test_db):
 
 
 @pytest.fixture
-def setup_restricted_channel(test_db):
+def setup_restricted_channel(test_db, user1, baseline):
     """Creates a channel where only admins can invite new members."""
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="regular_member", email="member@example.com")
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
 
     channel = Channel.create(
@@ -39,15 +37,14 @@ def setup_restricted_channel(test_db):
 
 
 @pytest.fixture
-def setup_channel_for_mentions(test_db, mocker):
+def setup_channel_for_mentions(test_db, mocker, user1, baseline):
     """
     Creates a channel with 3 members. Mocks chat_manager to set 2 of them as online.
     """
-    user1 = User.get_by_id(1)  # Logged in user
     user2 = User.create(id=2, username="zelda", email="zelda@example.com")
     user3 = User.create(id=3, username="link", email="link@example.com")
 
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
     WorkspaceMember.create(user=user3, workspace=workspace)
 
@@ -91,7 +88,7 @@ def test_non_admin_cannot_remove_member(
 
 
 def test_admin_cannot_remove_last_admin(
-    logged_in_client, setup_channel_with_admin_and_member
+    logged_in_client, setup_channel_with_admin_and_member, user1
 ):
     """
     Covers: `remove_channel_member` last admin safety check.
@@ -121,7 +118,7 @@ def test_admin_cannot_remove_last_admin(
     membership_to_delete.save()
 
     # Now, try to remove the last admin. This is a bit contrived but covers the code path.
-    last_admin = User.get_by_id(1)
+    last_admin = user1
     response = logged_in_client.delete(
         f"/chat/channel/{channel.id}/members/{last_admin.id}"
     )
@@ -341,11 +338,10 @@ def test_create_first_channel_removes_placeholder(logged_in_client):
     )
 
 
-def test_mention_search_in_dm(logged_in_client):
+def test_mention_search_in_dm(logged_in_client, user1):
     """
     Covers: `mention_search` logic for DM conversations.
     """
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="dm_partner", email="dm@partner.com")
     conv, _ = Conversation.get_or_create(
         conversation_id_str=f"dm_{user1.id}_{user2.id}", type="dm"
@@ -485,11 +481,10 @@ def test_mention_search_plural_counts(logged_in_client, setup_channel_for_mentio
     assert b"Notifies 2 online members." in response.data
 
 
-def test_mention_search_singular_counts(logged_in_client, mocker):
+def test_mention_search_singular_counts(logged_in_client, mocker, user1):
     """
     Covers: `mention_search` singularization logic with only one member.
     """
-    user1 = User.get_by_id(1)
     channel = Channel.create(workspace_id=1, name="solo-channel")
     conv, _ = Conversation.get_or_create(
         conversation_id_str=f"channel_{channel.id}", type="channel"
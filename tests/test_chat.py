@@ -4,46 +4,43 @@ import datetime
 
 import pytest
 
-from app.models import (
-    Channel,
-    ChannelMember,
-    Conversation,
-    Message,
-    User,
-    UserConversationStatus,
-    WorkspaceMember,
-    db,
-)
+from app.models import Channel, ChannelMember, User, WorkspaceMember
 
 
-@pytest.fixture
-def setup_admin_and_member(test_db):
-    """Sets up a channel with an admin (user1) and a regular member (user2)."""
-    user1 = User.get_by_id(1)
-    user2 = User.create(id=2, username="regular_user", email="regular@example.com")
+@pytest.fixture(scope="module")
+def setup_admin_and_member(database, baseline):
+    """
+    Sets up a channel with an admin (user1) and a regular member (user2).
+    Built once per module; each test's changes are rolled back by `test_db`.
+    """
+    user1 = baseline.user1
+    user2 = User.create(username="regular_user", email="regular@example.com")
 
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
 
     channel = Channel.create(workspace=workspace, name="managed-channel")
-    # User 1 is the admin
-    ChannelMember.create(user=user1, channel=channel, role="admin")
-    # User 2 is a regular member
-    ChannelMember.create(user=user2, channel=channel)
+    # User 1 is the admin, user 2 a regular member
+    ChannelMember.insert_many(
+        [
+            {"user": user1, "channel": channel, "role": "admin"},
+            {"user": user2, "channel": channel},
+        ]
+    ).execute()
 
     return {"admin": user1, "member": user2, "channel": channel}
 
 
-@pytest.fixture
-def setup_channel_and_users(test_db):
+@pytest.fixture(scope="module")
+def setup_channel_and_users(database, baseline):
     """
     Sets up a channel with one member (the default testuser) and a second user
-    who is a member of the workspace but not the channel.
+    who is a member of the workspace but not the channel. Built once per module.
     """
-    user1 = User.get_by_id(1)
-    user2 = User.create(id=2, username="anotheruser", email="another@example.com")
+    user1 = baseline.user1
+    user2 = User.create(username="anotheruser", email="another@example.com")
     # Both users need to be in the workspace to be eligible for channel membership
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
 
     channel = Channel.create(workspace=workspace, name="team-channel")
@@ -62,7 +59,7 @@ def test_get_create_channel_form(logged_in_client):
     assert b"Create a New Channel" in response.data
 
 
-def test_create_new_public_channel(logged_in_client):
+def test_create_new_public_channel(logged_in_client, user1):
     """
     WHEN a logged-in user posts valid data to create a public channel
     THEN check the channel is created and the user is a member.
@@ -80,20 +77,18 @@ def test_create_new_public_channel(logged_in_client):
     assert channel is not None
     assert channel.is_private is False
 
-    test_user = User.get_by_id(1)
-    member = ChannelMember.get_or_none(user=test_user, channel=channel)
+    member = ChannelMember.get_or_none(user=user1, channel=channel)
     assert member is not None
 
 
-def test_access_channel_as_member(logged_in_client):
+def test_access_channel_as_member(logged_in_client, user1):
     """
     GIVEN a channel that the user is a member of
     WHEN the user requests the channel chat
     THEN check for a 200 OK response.
     """
-    # Use the endpoint to create the channel, ensuring correct state
-    logged_in_client.post("/chat/channels/create", data={"name": "member-channel"})
-    channel = Channel.get(name="member-channel")
+    channel = Channel.create(workspace_id=1, name="member-channel")
+    ChannelMember.create(user=user1, channel=channel)
 
     response = logged_in_client.get(f"/chat/channel/{channel.id}")
     assert response.status_code == 200
@@ -169,155 +164,212 @@ def test_create_channel_sanitizes_name(logged_in_client):
     assert Channel.get_or_none(name=sanitized_name) is not None
 
 
-def test_chat_interface_loads_data_correctly(logged_in_client):
+@pytest.fixture
+def unread_scenario(test_db, user1):
     """
-    GIVEN a user with unread messages in both a channel and a DM
-    WHEN the main chat interface is loaded
-    THEN it should correctly display the channels, DMs, and unread counts.
+    User2 has posted one message in a channel and one in a DM with user1,
+    both newer than user1's last read time. Returns the channel, user2 and
+    the two conversations.
     """
-    # --- Setup ---
-    user1 = User.get_by_id(1)
+    # Only this scenario touches conversations/messages, so import them here.
+    from app.models import Conversation, Message, UserConversationStatus
+
     user2 = User.create(
-        id=2, username="user_two", email="two@example.com", display_name="User Two"
+        username="user_two", email="two@example.com", display_name="User Two"
     )
     WorkspaceMember.create(user=user2, workspace_id=1)  # Add user2 to the workspace
 
-    # Use the endpoint to create the channel, which also makes user1 a member.
-    logged_in_client.post("/chat/channels/create", data={"name": "test-channel-unread"})
+    channel = Channel.create(workspace_id=1, name="test-channel-unread")
+    ChannelMember.create(user=user1, channel=channel)
 
-    # Now get the models we need from the database
-    channel = Channel.get(name="test-channel-unread")
-    channel_conv, _ = Conversation.get_or_create(
+    channel_conv = Conversation.create(
         conversation_id_str=f"channel_{channel.id}", type="channel"
     )
-    dm_conv, _ = Conversation.get_or_create(
+    dm_conv = Conversation.create(
         conversation_id_str=f"dm_{user1.id}_{user2.id}", type="dm"
     )
 
     # Set last read time to yesterday
     yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-    UserConversationStatus.create(
-        user=user1, conversation=channel_conv, last_read_timestamp=yesterday
-    )
-    UserConversationStatus.create(
-        user=user1, conversation=dm_conv, last_read_timestamp=yesterday
-    )
+    UserConversationStatus.insert_many(
+        [
+            {"user": user1, "conversation": conv, "last_read_timestamp": yesterday}
+            for conv in (channel_conv, dm_conv)
+        ]
+    ).execute()
 
     # User2 posts messages, making them unread for user1
-    Message.create(user=user2, conversation=channel_conv, content="Unread channel msg")
-    Message.create(user=user2, conversation=dm_conv, content="Unread DM")
+    Message.insert_many(
+        [
+            {
+                "user": user2,
+                "conversation": channel_conv,
+                "content": "Unread channel msg",
+            },
+            {"user": user2, "conversation": dm_conv, "content": "Unread DM"},
+        ]
+    ).execute()
+
+    return {
+        "channel": channel,
+        "user2": user2,
+        "channel_conv": channel_conv,
+        "dm_conv": dm_conv,
+    }
+
+
+def test_chat_interface_loads_data_correctly(logged_in_client, unread_scenario):
+    """
+    GIVEN a user with unread messages in both a channel and a DM
+    WHEN the main chat interface is loaded
+    THEN it should correctly display the channels, DMs, and unread counts.
+    """
+    channel = unread_scenario["channel"]
+    user2 = unread_scenario["user2"]
 
     # --- Act ---
     response = logged_in_client.get("/chat")
 
     # --- Assert ---
     assert response.status_code == 200
+    body = response.get_data()
 
     # Check for channel and DM user
-    assert b"# test-channel-unread" in response.data
-    assert b"User Two" in response.data
+    assert b"# test-channel-unread" in body
+    assert b"User Two" in body
 
     # For the DM, we still expect a red badge with a count of 1.
-    dm_badge_id = f"unread-badge-dm_{user1.id}_{user2.id}"
-    assert f'<span id="{dm_badge_id}">'.encode() in response.data
-    assert b'<span class="badge rounded-pill bg-danger">1</span>' in response.data
+    dm_badge_id = f"unread-badge-dm_1_{user2.id}"
+    assert f'<span id="{dm_badge_id}">'.encode() in body
+    assert b'<span class="badge rounded-pill bg-danger">1</span>' in body
 
     # For the channel, we now expect NO badge, but the link should be bold.
     channel_link_id = f"link-channel_{channel.id}"
 
     # Assert the badge itself is NOT present
-    assert b'<span class="badge rounded-pill bg-danger float-end">' not in response.data
+    assert b'<span class="badge rounded-pill bg-danger float-end">' not in body
     # Assert that the link IS bold and white by checking for its unique classes
-    assert f'id="{channel_link_id}"'.encode() in response.data
-    assert b'class="text-decoration-none fw-bold text-white"' in response.data
-
-
-def test_admin_can_remove_member(logged_in_client, setup_admin_and_member):
-    """
-    GIVEN a channel admin (user1) and a member (user2)
-    WHEN the admin removes the member
-    THEN the member's ChannelMember record should be deleted.
-    """
-    channel = setup_admin_and_member["channel"]
-    member_to_remove = setup_admin_and_member["member"]
-
-    # Ensure the member exists before the action
-    assert ChannelMember.get_or_none(user=member_to_remove, channel=channel) is not None
-
-    response = logged_in_client.delete(
-        f"/chat/channel/{channel.id}/members/{member_to_remove.id}"
-    )
-
-    assert response.status_code == 200
-    # Ensure the member has been removed
-    assert ChannelMember.get_or_none(user=member_to_remove, channel=channel) is None
-
-
-def test_member_cannot_remove_other_member(logged_in_client, setup_admin_and_member):
-    """
-    GIVEN a regular member (user2)
-    WHEN they attempt to remove the admin (user1)
-    THEN they should receive a 403 Forbidden error.
-    """
-    channel = setup_admin_and_member["channel"]
-    admin_user = setup_admin_and_member["admin"]
-    member_user = setup_admin_and_member["member"]
-
-    # Log in as the regular member
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = member_user.id
-
-    response = logged_in_client.delete(
-        f"/chat/channel/{channel.id}/members/{admin_user.id}"
-    )
-
-    assert response.status_code == 403
-    # Ensure the admin was NOT removed
-    assert ChannelMember.get_or_none(user=admin_user, channel=channel) is not None
-
-
-def test_admin_can_change_channel_settings(logged_in_client, setup_admin_and_member):
-    """
-    GIVEN a channel admin
-    WHEN they update the channel's settings (e.g., make it private)
-    THEN the channel's properties should be updated in the database.
+    assert f'id="{channel_link_id}"'.encode() in body
+    assert b'class="text-decoration-none fw-bold text-white"' in body
+
+
+def _channel_state(channel, admin, member):
+    """Snapshot of everything the permission matrix below can change."""
+    channel = Channel.get_by_id(channel.id)
+    return {
+        "admin_in_channel": ChannelMember.get_or_none(user=admin, channel=channel)
+        is not None,
+        "member_in_channel": ChannelMember.get_or_none(user=member, channel=channel)
+        is not None,
+        "is_private": channel.is_private,
+        "posting_restricted": channel.posting_restricted_to_admins,
+    }
+
+
+@pytest.mark.parametrize(
+    "actor, method, path, payload, expected_status, expected_state, error",
+    [
+        pytest.param(
+            "admin",
+            "DELETE",
+            "/chat/channel/{channel}/members/{member}",
+            None,
+            200,
+            {"member_in_channel": False},
+            None,
+            id="admin-removes-member",
+        ),
+        pytest.param(
+            "member",
+            "DELETE",
+            "/chat/channel/{channel}/members/{admin}",
+            None,
+            403,
+            {"admin_in_channel": True},
+            None,
+            id="member-cannot-remove-admin",
+        ),
+        pytest.param(
+            "admin",
+            "PUT",
+            "/chat/channel/{channel}/settings",
+            {"is_private": "on", "posting_restricted": "on"},
+            200,
+            {"is_private": True, "posting_restricted": True},
+            None,
+            id="admin-changes-settings",
+        ),
+        pytest.param(
+            "member",
+            "PUT",
+            "/chat/channel/{channel}/settings",
+            {"is_private": "on"},
+            403,
+            {"is_private": False},
+            b"You do not have permission",
+            id="member-cannot-change-settings",
+        ),
+    ],
+)
+def test_channel_permission_matrix(
+    logged_in_client_as,
+    setup_admin_and_member,
+    actor,
+    method,
+    path,
+    payload,
+    expected_status,
+    expected_state,
+    error,
+):
+    """
+    GIVEN a channel with an admin (user1) and a regular member (user2)
+    WHEN either of them removes a member or changes the channel settings
+    THEN only the admin's requests succeed and change the channel.
     """
     channel = setup_admin_and_member["channel"]
-    assert channel.is_private is False
-
-    response = logged_in_client.put(
-        f"/chat/channel/{channel.id}/settings",
-        data={"is_private": "on", "posting_restricted": "on"},
+    admin = setup_admin_and_member["admin"]
+    member = setup_admin_and_member["member"]
+
+    assert _channel_state(channel, admin, member) == {
+        "admin_in_channel": True,
+        "member_in_channel": True,
+        "is_private": False,
+        "posting_restricted": False,
+    }
+
+    client = logged_in_client_as(setup_admin_and_member[actor].id)
+    response = client.open(
+        path.format(channel=channel.id, admin=admin.id, member=member.id),
+        method=method,
+        data=payload,
     )
 
-    assert response.status_code == 200
+    assert response.status_code == expected_status
+    if error:
+        assert error in response.data
+    state = _channel_state(channel, admin, member)
+    for key, value in expected_state.items():
+        assert state[key] == value
 
-    # Re-fetch the channel from the DB to check its updated state
-    updated_channel = Channel.get_by_id(channel.id)
-    assert updated_channel.is_private is True
-    assert updated_channel.posting_restricted_to_admins is True
 
-
-def test_user_can_join_public_channel(logged_in_client):
+def test_user_can_join_public_channel(logged_in_client_as):
     """
     GIVEN a public channel the user is not a member of
     WHEN the user posts to the join_channel endpoint
     THEN they should be added as a member.
     """
-    user_to_join = User.create(id=2, username="new_joiner", email="joiner@example.com")
+    user_to_join = User.create(username="new_joiner", email="joiner@example.com")
     WorkspaceMember.create(user=user_to_join, workspace_id=1)
 
     public_channel = Channel.create(
         workspace_id=1, name="public-for-joining", is_private=False
     )
 
-    # Log in as the new user
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = user_to_join.id
-
     assert ChannelMember.get_or_none(user=user_to_join, channel=public_channel) is None
 
-    response = logged_in_client.post(f"/chat/channel/{public_channel.id}/join")
+    client = logged_in_client_as(user_to_join.id)
+    response = client.post(f"/chat/channel/{public_channel.id}/join")
 
     assert response.status_code == 200
     assert (
@@ -325,27 +377,6 @@ def test_user_can_join_public_channel(logged_in_client):
     )
 
 
-def test_non_admin_cannot_change_settings(logged_in_client, setup_admin_and_member):
-    """
-    GIVEN a regular channel member
-    WHEN they attempt to update channel settings
-    THEN they should receive a 403 Forbidden error.
-    """
-    channel = setup_admin_and_member["channel"]
-    member_user = setup_admin_and_member["member"]
-
-    # Log in as the non-admin member
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = member_user.id
-
-    response = logged_in_client.put(
-        f"/chat/channel/{channel.id}/settings", data={"is_private": "on"}
-    )
-
-    assert response.status_code == 403
-    assert b"You do not have permission" in response.data
-
-
 def test_user_cannot_leave_announcements_channel(logged_in_client):
     """
     GIVEN the special 'announcements' channel
@@ -362,83 +393,39 @@ def test_user_cannot_leave_announcements_channel(logged_in_client):
     assert b"cannot leave the announcements channel" in response.data
 
 
-def test_admin_cannot_demote_last_admin(logged_in_client, setup_admin_and_member):
+def test_admin_can_demote_another_admin(logged_in_client, setup_admin_and_member):
     """
-    GIVEN a channel with only one admin
-    WHEN another, newly added admin, tries to demote that original admin
-    THEN the demotion should succeed, leaving the new admin as the sole admin.
-    However, if we try to demote the sole remaining admin, it should fail.
+    GIVEN a channel with two admins
+    WHEN one admin demotes the other
+    THEN the demotion succeeds, since the channel still has an admin left.
+    (The sole-admin guard itself is covered in test_channels.py.)
     """
     channel = setup_admin_and_member["channel"]
-    original_admin = setup_admin_and_member["admin"]  # user 1
+    member = setup_admin_and_member["member"]
+    ChannelMember.update(role="admin").where(
+        (ChannelMember.user == member) & (ChannelMember.channel == channel)
+    ).execute()
 
-    # At this point, the channel has one admin. The business logic states that
-    # to demote an admin, the admin_count must be > 1.
-    # Let's create a second admin to perform the action.
-    second_admin = User.create(
-        id=3, username="second_admin", email="admin2@example.com"
-    )
-    WorkspaceMember.create(user=second_admin, workspace=channel.workspace)
-    ChannelMember.create(user=second_admin, channel=channel, role="admin")
-
-    # Log in as the original admin (user 1)
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = original_admin.id
-
-    # Demote the second admin. The admin count is 2, so this should succeed.
     response = logged_in_client.put(
-        f"/chat/channel/{channel.id}/members/{second_admin.id}/role",
+        f"/chat/channel/{channel.id}/members/{member.id}/role",
         data={"role": "member"},
     )
-    assert response.status_code == 200
-
-    # Now, the original_admin is the sole admin again.
-    # The member count for `second_admin` is now 'member'.
-    # We will try to demote the sole admin (original_admin). This cannot be done
-    # by `original_admin` (can't demote self). It cannot be done by `second_admin`
-    # (not an admin anymore).
-    # The only way to test the logic is to create a scenario where an admin tries
-    # to demote a user who is the sole admin.
-
-    # Re-promote second_admin so we have two again.
-    logged_in_client.put(
-        f"/chat/channel/{channel.id}/members/{second_admin.id}/role",
-        data={"role": "admin"},
-    )
-
-    # We need to simulate a state where the `membership_to_modify` IS the last admin
-    # To do this, we'll manually delete one admin from the DB to set up the state
-    with db.atomic():
-        ChannelMember.delete().where(
-            (ChannelMember.user == second_admin) & (ChannelMember.channel == channel)
-        ).execute()
-
-    # Get the state right: 2 admins in channel.
-    admin1 = original_admin
-    admin2 = second_admin  # from above
 
-    # Log in as admin1
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = admin1.id
-
-    # Demote admin2. This works, admin_count is 2.
-    response = logged_in_client.put(
-        f"/chat/channel/{channel.id}/members/{admin2.id}/role", data={"role": "member"}
-    )
     assert response.status_code == 200
+    assert ChannelMember.get(user=member, channel=channel).role == "member"
 
-    # Now admin1 is the sole admin. Re-promote admin2.
-    response = logged_in_client.put(
-        f"/chat/channel/{channel.id}/members/{admin2.id}/role", data={"role": "admin"}
-    )
-    assert response.status_code == 200
 
-    # This test asserts that the application correctly prevents a non-admin from changing roles.
-    member_user = setup_admin_and_member["member"]
-    with logged_in_client.session_transaction() as sess:
-        sess["user_id"] = member_user.id  # Log in as a non-admin
+def test_non_admin_cannot_change_roles(logged_in_client_as, setup_admin_and_member):
+    """
+    GIVEN a regular channel member
+    WHEN they try to demote the channel admin
+    THEN they should receive a 403 Forbidden error.
+    """
+    channel = setup_admin_and_member["channel"]
+    original_admin = setup_admin_and_member["admin"]
 
-    response = logged_in_client.put(
+    client = logged_in_client_as(setup_admin_and_member["member"].id)
+    response = client.put(
         f"/chat/channel/{channel.id}/members/{original_admin.id}/role",
         data={"role": "member"},
     )
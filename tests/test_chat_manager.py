@@ -16,6 +16,19 @@ class _LoopExit(BaseException):
     """
 
 
+@pytest.fixture(autouse=True)
+def test_db(app, mocker):
+    """
+    Overrides the conftest fixture: ChatManager is in-memory state, so these
+    tests skip the schema build entirely. Only an app context is pushed (the
+    manager logs through `current_app`), and the one model lookup
+    `unsubscribe()` makes is stubbed out.
+    """
+    mocker.patch("app.chat_manager.Conversation.get_or_none", return_value=None)
+    with app.app_context():
+        yield
+
+
 @pytest.fixture
 def chat_manager(mocker):
     """
@@ -368,3 +381,32 @@ def test_dispatch_routes_channel_message_to_subscribed_client(app, chat_manager)
 
         on_channel.send.assert_called_once()
         off_channel.send.assert_not_called()
+
+
+@pytest.mark.parametrize("num_clients", [2, 1000])
+def test_dispatch_drops_failing_clients(chat_manager, num_clients):
+    """A fan-out where half the sockets raise keeps the healthy half and
+    removes every failing socket (and its user) without touching the rest."""
+    sockets = []
+    for user_id in range(1, num_clients + 1):
+        ws = Mock()
+        ws.channel_id = "channel_1"
+        ws.is_api_client = False
+        ws.user.id = user_id
+        if user_id % 2:
+            ws.send.side_effect = Exception("Socket Closed")
+        chat_manager.set_online(user_id, ws)
+        sockets.append(ws)
+
+    chat_manager._dispatch(
+        {
+            "type": "pmessage",
+            "channel": b"chat:channel_1",
+            "data": json.dumps({"_raw_html": "<p>hi</p>"}),
+        }
+    )
+
+    healthy = {ws for ws in sockets if not ws.user.id % 2}
+    assert chat_manager.clients == healthy
+    assert set(chat_manager.all_clients) == {ws.user.id for ws in healthy}
+    assert chat_manager.sends_failed == num_clients // 2
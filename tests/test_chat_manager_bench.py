@@ -0,0 +1,101 @@
+# tests/test_chat_manager_bench.py
+#
+# Timings for the ChatManager fan-out paths. pytest.ini passes
+# `--benchmark-disable`, so in a normal run each benchmark body executes once as
+# a plain test. Collect real numbers with:
+#
+#   bin/python -m pytest tests/test_chat_manager_bench.py --benchmark-only --benchmark-enable
+#
+# Every round gets a fresh manager from `setup`, so Mock construction and
+# subscription bookkeeping stay out of the measured time.
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from app.chat_manager import ChatManager
+
+NUM_CLIENTS = 1000
+ROUNDS = 50
+MESSAGE = "<p>x</p>"
+
+
+@pytest.fixture(autouse=True)
+def test_db():
+    """Overrides the conftest fixture: these benchmarks never touch the DB."""
+    yield
+
+
+def _manager_with_clients(channel_id):
+    """A ChatManager with NUM_CLIENTS online sockets, all subscribed to
+    `channel_id`. Sockets are attached directly rather than via subscribe(),
+    which would also run the read-status/typing bookkeeping for each one."""
+    cm = ChatManager()
+    cm.redis_client = Mock()
+    for user_id in range(1, NUM_CLIENTS + 1):
+        ws = Mock()
+        ws.channel_id = channel_id
+        ws.is_api_client = False
+        ws.user.id = user_id
+        cm.set_online(user_id, ws)
+    return cm
+
+
+def _pmessage(channel, payload):
+    """The shape of a message coming off the Valkey pub/sub listener."""
+    return {
+        "type": "pmessage",
+        "channel": channel.encode(),
+        "data": json.dumps(payload),
+    }
+
+
+def test_bench_broadcast(benchmark):
+    def setup():
+        cm = ChatManager()
+        cm.redis_client = Mock()
+        return (cm, "c", MESSAGE), {}
+
+    benchmark.pedantic(
+        lambda cm, channel_id, message: cm.broadcast(channel_id, message),
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+def test_bench_broadcast_to_all(benchmark):
+    def setup():
+        cm = ChatManager()
+        cm.redis_client = Mock()
+        return (cm, MESSAGE), {}
+
+    benchmark.pedantic(
+        lambda cm, message: cm.broadcast_to_all(message),
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+def test_bench_dispatch_channel(benchmark):
+    """The receiving side of broadcast(): fan a chat:* message out locally."""
+
+    def setup():
+        cm = _manager_with_clients("c")
+        return (cm, _pmessage("chat:c", {"_raw_html": MESSAGE})), {}
+
+    benchmark.pedantic(
+        lambda cm, message: cm._dispatch(message), setup=setup, rounds=ROUNDS
+    )
+
+
+def test_bench_dispatch_global(benchmark):
+    """The receiving side of broadcast_to_all(): every online socket."""
+
+    def setup():
+        cm = _manager_with_clients(None)
+        return (cm, _pmessage("global:events", {"_raw_html": MESSAGE})), {}
+
+    benchmark.pedantic(
+        lambda cm, message: cm._dispatch(message), setup=setup, rounds=ROUNDS
+    )
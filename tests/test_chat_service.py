@@ -1,4 +1,5 @@
 import pytest
+from peewee import fn
 
 from app.chat_manager import chat_manager
 from app.models import (
@@ -13,19 +14,21 @@ from app.models import (
 from app.services import chat_service
 
 
-@pytest.fixture
-def setup_channel_and_users(test_db):
+@pytest.fixture(scope="module")
+def setup_channel_and_users(database, baseline):
     """
     Sets up a standard testing environment with a channel and three users.
     - user1: The default logged-in user who will be the sender.
     - user2: A member of the channel.
     - user3: A member of the channel.
+    Built once per module; the messages and mentions each test writes are
+    rolled back by `test_db`.
     """
-    user1 = User.get_by_id(1)
-    user2 = User.create(id=2, username="zelda", email="zelda@example.com")
-    user3 = User.create(id=3, username="link", email="link@example.com")
+    user1 = baseline.user1
+    user2 = User.create(username="zelda", email="zelda@example.com")
+    user3 = User.create(username="link", email="link@example.com")
 
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     WorkspaceMember.create(user=user2, workspace=workspace)
     WorkspaceMember.create(user=user3, workspace=workspace)
 
@@ -41,14 +44,17 @@ def setup_channel_and_users(test_db):
     return {"sender": user1, "user2": user2, "user3": user3, "conversation": conv}
 
 
+@pytest.mark.max_queries(6)
 def test_handle_new_message_creates_message(setup_channel_and_users):
     """
-    Tests that a basic message is created successfully.
+    Tests that a basic message is created successfully, without any of the
+    mention lookups a message with no "@" in it doesn't need.
     """
     sender = setup_channel_and_users["sender"]
     conversation = setup_channel_and_users["conversation"]
 
-    assert Message.select().count() == 0
+    # Newest id before the call; everything above it was written by the call.
+    baseline_id = Message.select(fn.MAX(Message.id)).scalar() or 0
 
     new_message = chat_service.handle_new_message(
         sender=sender,
@@ -57,7 +63,8 @@ def test_handle_new_message_creates_message(setup_channel_and_users):
         parent_id=None,
     )
 
-    assert Message.select().count() == 1
+    new_rows = Message.select(Message.content).where(Message.id > baseline_id)
+    assert [m.content for m in new_rows] == ["Hello world!"]
     assert new_message.content == "Hello world!"
     assert new_message.user == sender
     assert Mention.select().count() == 0
@@ -79,10 +86,33 @@ def test_handle_new_message_creates_username_mentions(setup_channel_and_users):
 
     assert Mention.select().count() == 1
     mention = Mention.get()
-    assert mention.user == user2
-    assert mention.message == new_message
+    # Compare the FK columns; `mention.user` would cost a SELECT per access.
+    assert mention.user_id == user2.id
+    assert mention.message_id == new_message.id
 
 
+@pytest.mark.max_queries(7)
+def test_handle_new_message_resolves_usernames_in_one_query(setup_channel_and_users):
+    """
+    Tests that several @username mentions (and unknown names) are resolved
+    with one user lookup and written with one insert.
+    """
+    sender = setup_channel_and_users["sender"]
+    user2 = setup_channel_and_users["user2"]
+    user3 = setup_channel_and_users["user3"]
+    conversation = setup_channel_and_users["conversation"]
+
+    chat_service.handle_new_message(
+        sender=sender,
+        conversation=conversation,
+        chat_text=f"@{user2.username} @{user3.username} and @nobody, take a look",
+    )
+
+    assert Mention.select().count() == 2
+    assert {m.user_id for m in Mention.select()} == {user2.id, user3.id}
+
+
+@pytest.mark.max_queries(7)
 def test_handle_new_message_creates_channel_mentions(setup_channel_and_users):
     """
     Tests that @channel creates mentions for all channel members except the sender.
@@ -98,10 +128,11 @@ def test_handle_new_message_creates_channel_mentions(setup_channel_and_users):
 
     # Should be 2 mentions: user2 and user3. The sender (user1) is excluded.
     assert Mention.select().count() == 2
-    mentioned_user_ids = {m.user.id for m in Mention.select()}
+    mentioned_user_ids = {m.user_id for m in Mention.select()}
     assert mentioned_user_ids == {user2.id, user3.id}
 
 
+@pytest.mark.max_queries(7)
 def test_handle_new_message_creates_here_mentions_for_online_users(
     setup_channel_and_users, mocker
 ):
@@ -123,8 +154,25 @@ def test_handle_new_message_creates_here_mentions_for_online_users(
 
     # Should be 1 mention for user2. Sender is excluded, user3 is offline.
     assert Mention.select().count() == 1
-    mention = Mention.get()
-    assert mention.user == user2
+    assert Mention.get().user_id == user2.id
+
+
+@pytest.mark.max_queries(4)
+def test_handle_new_message_here_with_nobody_online(setup_channel_and_users, mocker):
+    """
+    Tests that @here with no one online creates no mentions and doesn't
+    query the channel's members at all.
+    """
+    sender = setup_channel_and_users["sender"]
+    conversation = setup_channel_and_users["conversation"]
+
+    mocker.patch.dict(chat_manager.online_users, {}, clear=True)
+
+    chat_service.handle_new_message(
+        sender=sender, conversation=conversation, chat_text="Anyone @here?"
+    )
+
+    assert Mention.select().count() == 0
 
 
 def test_handle_new_message_creates_no_self_mentions(setup_channel_and_users):
@@ -22,53 +22,47 @@ from app.models import (
     Mention,
     Message,
     Reaction,
-    User,
-    Workspace,
     WorkspaceMember,
 )
 
 
 @pytest.fixture
-def message(app):
+def message(app, baseline, user1):
     """Create a real message we can react to / mention against."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="constraints")
         conv, _ = Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}",
             defaults={"type": "channel"},
         )
-        user = User.get_by_id(1)
-        msg = Message.create(user=user, conversation=conv, content="hi")
+        msg = Message.create(user=user1, conversation=conv, content="hi")
         return msg.id
 
 
 class TestReactionUniqueness:
-    def test_same_user_emoji_message_combo_is_unique(self, app, message):
+    def test_same_user_emoji_message_combo_is_unique(self, app, message, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             msg = Message.get_by_id(message)
-            Reaction.create(user=user, message=msg, emoji="👍")
+            Reaction.create(user=user1, message=msg, emoji="👍")
             with pytest.raises(IntegrityError):
-                Reaction.create(user=user, message=msg, emoji="👍")
+                Reaction.create(user=user1, message=msg, emoji="👍")
 
-    def test_different_emoji_same_message_is_allowed(self, app, message):
+    def test_different_emoji_same_message_is_allowed(self, app, message, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             msg = Message.get_by_id(message)
-            Reaction.create(user=user, message=msg, emoji="👍")
-            Reaction.create(user=user, message=msg, emoji="🎉")  # no error
+            Reaction.create(user=user1, message=msg, emoji="👍")
+            Reaction.create(user=user1, message=msg, emoji="🎉")  # no error
             assert Reaction.select().where(Reaction.message == msg).count() == 2
 
 
 class TestMentionUniqueness:
-    def test_same_user_message_combo_is_unique(self, app, message):
+    def test_same_user_message_combo_is_unique(self, app, message, user1):
         with app.app_context():
-            user = User.get_by_id(1)
             msg = Message.get_by_id(message)
-            Mention.create(user=user, message=msg)
+            Mention.create(user=user1, message=msg)
             with pytest.raises(IntegrityError):
-                Mention.create(user=user, message=msg)
+                Mention.create(user=user1, message=msg)
 
 
 class TestChannelMemberDoesntDoubleAdd:
@@ -80,17 +74,16 @@ class TestChannelMemberDoesntDoubleAdd:
     update this test to ``pytest.raises(IntegrityError)``.
     """
 
-    def test_get_or_create_is_idempotent(self, app):
+    def test_get_or_create_is_idempotent(self, app, baseline, user1):
         with app.app_context():
-            workspace = Workspace.get(Workspace.name == "DevOcho")
+            workspace = baseline.workspace
             channel = Channel.create(workspace=workspace, name="member-idem")
-            user = User.get_by_id(1)
-            ChannelMember.get_or_create(user=user, channel=channel)
-            ChannelMember.get_or_create(user=user, channel=channel)
+            ChannelMember.get_or_create(user=user1, channel=channel)
+            ChannelMember.get_or_create(user=user1, channel=channel)
             assert (
                 ChannelMember.select()
                 .where(
-                    (ChannelMember.user == user) & (ChannelMember.channel == channel)
+                    (ChannelMember.user == user1) & (ChannelMember.channel == channel)
                 )
                 .count()
                 == 1
@@ -98,16 +91,15 @@ class TestChannelMemberDoesntDoubleAdd:
 
 
 class TestWorkspaceMemberIdempotency:
-    def test_get_or_create_is_idempotent(self, app):
+    def test_get_or_create_is_idempotent(self, app, baseline, user1):
         with app.app_context():
-            workspace = Workspace.get(Workspace.name == "DevOcho")
-            user = User.get_by_id(1)
-            WorkspaceMember.get_or_create(user=user, workspace=workspace)
-            WorkspaceMember.get_or_create(user=user, workspace=workspace)
+            workspace = baseline.workspace
+            WorkspaceMember.get_or_create(user=user1, workspace=workspace)
+            WorkspaceMember.get_or_create(user=user1, workspace=workspace)
             assert (
                 WorkspaceMember.select()
                 .where(
-                    (WorkspaceMember.user == user)
+                    (WorkspaceMember.user == user1)
                     & (WorkspaceMember.workspace == workspace)
                 )
                 .count()
@@ -1,6 +1,10 @@
 import pytest
 
-from app.conversation_id import ConversationKey, parse_conversation_id
+from app.conversation_id import (
+    ConversationKey,
+    dm_conversation_id,
+    parse_conversation_id,
+)
 
 
 class TestParseChannel:
@@ -60,6 +64,18 @@ class TestParseDm:
             parse_conversation_id("dm_3_abc")
 
 
+class TestBuildDm:
+    def test_ids_are_ordered_either_way(self):
+        assert dm_conversation_id(3, 12) == "dm_3_12"
+        assert dm_conversation_id(12, 3) == "dm_3_12"
+
+    def test_self_dm(self):
+        assert dm_conversation_id(7, 7) == "dm_7_7"
+
+    def test_round_trips_through_parse(self):
+        assert parse_conversation_id(dm_conversation_id(9, 2)).user_ids == (2, 9)
+
+
 class TestParseMalformed:
     @pytest.mark.parametrize(
         "value",
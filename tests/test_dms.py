@@ -1,4 +1,7 @@
 # tests/test_dms.py
+import datetime
+from html.parser import HTMLParser
+
 import pytest
 from app.models import User, Conversation, UserConversationStatus, WorkspaceMember
 
@@ -6,16 +9,41 @@ from app.models import User, Conversation, UserConversationStatus, WorkspaceMemb
 DM_SEARCH_PAGE_SIZE = 20
 
 
+class _DMUserList(HTMLParser):
+    """
+    Reads a rendered DM user list: the `data-username` of every row, and
+    whether a "Load More" trigger for the next page is present. Lets tests
+    compare exact usernames instead of scanning the body for substrings
+    (where "dm_partner" would also match "dm_partner_2").
+    """
+
+    def __init__(self, html):
+        super().__init__()
+        self.usernames = set()
+        self.has_more = False
+        self.feed(html)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if "data-username" in attrs:
+            self.usernames.add(attrs["data-username"])
+        if "page=" in attrs.get("hx-get", ""):
+            self.has_more = True
+
+
+def _dm_user_list(response):
+    return _DMUserList(response.get_data(as_text=True))
+
+
 @pytest.fixture
-def setup_dm_search_users(test_db):
+def setup_dm_search_users(test_db, user1, baseline):
     """
     Creates a number of users to test searching and pagination for starting DMs.
     - user1 (testuser) is the logged-in user.
     - user2 (dm_partner) is already in a DM with user1.
     - 25 other users (search_user_00 to search_user_24) are available to be searched.
     """
-    user1 = User.get_by_id(1)
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
 
     # User already in a DM
     user2 = User.create(id=2, username="dm_partner", email="partner@example.com")
@@ -23,16 +51,22 @@ def setup_dm_search_users(test_db):
     conv, _ = Conversation.get_or_create(conversation_id_str="dm_1_2", type="dm")
     UserConversationStatus.create(user=user1, conversation=conv)
 
-    # Create more users than will fit on one page
-    for i in range(DM_SEARCH_PAGE_SIZE + 5):
-        user = User.create(
-            id=i + 3,
+    # Create more users than will fit on one page, one INSERT per table
+    users = [
+        {
+            "id": i + 3,
             # Zero-pad the number to ensure correct alphabetical sorting
-            username=f"search_user_{i:02d}",
-            email=f"search{i}@example.com",
-            display_name=f"Search User {i:02d}",
-        )
-        WorkspaceMember.create(user=user, workspace=workspace)
+            "username": f"search_user_{i:02d}",
+            "email": f"search{i}@example.com",
+            "display_name": f"Search User {i:02d}",
+        }
+        for i in range(DM_SEARCH_PAGE_SIZE + 5)
+    ]
+    with test_db.atomic():
+        User.insert_many(users).execute()
+        WorkspaceMember.insert_many(
+            [{"user": u["id"], "workspace": workspace.id} for u in users]
+        ).execute()
 
 
 def test_get_start_dm_form_lists_other_users(logged_in_client, setup_dm_search_users):
@@ -44,14 +78,15 @@ def test_get_start_dm_form_lists_other_users(logged_in_client, setup_dm_search_u
     response = logged_in_client.get("/chat/dms/start")
 
     assert response.status_code == 200
+    listed = _dm_user_list(response)
     # The logged-in user should not be in the list
-    assert b"testuser" not in response.data
+    assert "testuser" not in listed.usernames
     # The user already in a DM should not be in the list
-    assert b"dm_partner" not in response.data
+    assert "dm_partner" not in listed.usernames
     # The first searchable user (with padding) should be present
-    assert b"search_user_00" in response.data
+    assert "search_user_00" in listed.usernames
     # Check for the "Load More" button since we created more users than the page size
-    assert b"Load More" in response.data
+    assert listed.has_more
 
 
 def test_search_users_for_dm(logged_in_client, setup_dm_search_users):
@@ -63,12 +98,10 @@ def test_search_users_for_dm(logged_in_client, setup_dm_search_users):
     response = logged_in_client.get("/chat/dms/search?q=search_user_15")
 
     assert response.status_code == 200
-    assert b"search_user_15" in response.data
-    # Check for a user that definitely does not match the query.
-    assert b"search_user_07" not in response.data
-    assert (
-        b"Load More" not in response.data
-    )  # Should not be a load more button for one result
+    listed = _dm_user_list(response)
+    assert listed.usernames == {"search_user_15"}
+    # Should not be a load more button for one result
+    assert not listed.has_more
 
 
 def test_search_users_for_dm_pagination(logged_in_client, setup_dm_search_users):
@@ -80,12 +113,14 @@ def test_search_users_for_dm_pagination(logged_in_client, setup_dm_search_users)
     response = logged_in_client.get("/chat/dms/search?q=search_user&page=2")
 
     assert response.status_code == 200
-    # The last user created should be on the second page
-    assert b"search_user_24" in response.data
-    # The first user should NOT be on the second page
-    assert b"search_user_00" not in response.data
+    listed = _dm_user_list(response)
+    # The second page holds exactly the users past the first page
+    assert listed.usernames == {
+        f"search_user_{i:02d}"
+        for i in range(DM_SEARCH_PAGE_SIZE, DM_SEARCH_PAGE_SIZE + 5)
+    }
     # There are no more pages, so the button should not be present
-    assert b"Load More" not in response.data
+    assert not listed.has_more
 
 
 def test_search_finds_existing_dm_partner(logged_in_client, setup_dm_search_users):
@@ -98,7 +133,7 @@ def test_search_finds_existing_dm_partner(logged_in_client, setup_dm_search_user
     response = logged_in_client.get("/chat/dms/search?q=dm_partner")
 
     assert response.status_code == 200
-    assert b"dm_partner" in response.data
+    assert _dm_user_list(response).usernames == {"dm_partner"}
 
 
 def test_search_matches_email(logged_in_client, setup_dm_search_users):
@@ -117,16 +152,15 @@ def test_search_matches_email(logged_in_client, setup_dm_search_users):
 
     assert response.status_code == 200
     # Matched only via the email address (username/display_name lack "luis").
-    assert b"lgarcia" in response.data
+    assert _dm_user_list(response).usernames == {"lgarcia"}
 
 
-def test_open_dm_chat_with_user(logged_in_client):
+def test_open_dm_chat_with_user(logged_in_client, user1):
     """
     GIVEN two users exist
     WHEN user 1 opens a DM chat with user 2 for the first time
     THEN a Conversation and two UserConversationStatus records should be created.
     """
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="anotheruser", email="another@example.com")
 
     assert Conversation.select().where(Conversation.type == "dm").count() == 0
@@ -148,6 +182,28 @@ def test_open_dm_chat_with_user(logged_in_client):
     assert status2 is not None
 
 
+def test_reopen_dm_marks_read_and_restores_partner(logged_in_client):
+    """
+    GIVEN an existing DM that the other user has left
+    WHEN user 1 opens it again
+    THEN user 1's read time moves forward and the partner's status is back.
+    """
+    user2 = User.create(id=2, username="anotheruser", email="another@example.com")
+    conv = Conversation.create(conversation_id_str="dm_1_2", type="dm")
+    long_ago = datetime.datetime(2020, 1, 1)
+    UserConversationStatus.create(
+        user_id=1, conversation=conv, last_read_timestamp=long_ago
+    )
+
+    response = logged_in_client.get(f"/chat/dm/{user2.id}")
+
+    assert response.status_code == 200
+    status1 = UserConversationStatus.get(user_id=1, conversation=conv)
+    assert status1.last_read_timestamp > long_ago
+    assert UserConversationStatus.get_or_none(user=user2, conversation=conv)
+    assert Conversation.select().where(Conversation.type == "dm").count() == 1
+
+
 def test_open_dm_with_nonexistent_user(logged_in_client):
     """
     Covers: `get_dm_chat` error handling for invalid user ID.
@@ -1,6 +1,8 @@
 # tests/test_files.py
 
-import io
+from unittest.mock import Mock
+
+import pytest
 
 from app.models import UploadedFile
 
@@ -17,7 +19,7 @@ TINY_PDF = (
 )
 
 
-def test_upload_file_success(logged_in_client, mocker):
+def test_upload_file_success(logged_in_client, mocker, make_upload):
     """
     GIVEN a logged-in user
     WHEN they upload a valid file
@@ -32,7 +34,7 @@ def test_upload_file_success(logged_in_client, mocker):
 
     # 2. Create an in-memory "file" to upload — must be a real PNG so the
     #    content sniffer accepts it.
-    file_data = {"file": (io.BytesIO(TINY_PNG), "test.png")}
+    file_data = make_upload(TINY_PNG, "test.png")
 
     # Act: Post the file data to the upload endpoint.
     response = logged_in_client.post(
@@ -55,82 +57,73 @@ def test_upload_file_success(logged_in_client, mocker):
     minio_mock.assert_called_once()
 
 
-def test_upload_no_file_part(logged_in_client):
-    """
-    WHEN a POST request is made without a 'file' part
-    THEN the server should return a 400 Bad Request error.
-    """
-    response = logged_in_client.post("/files/upload", data={})
-    assert response.status_code == 400
-    assert response.json["error"] == "No file part"
-
-
-def test_upload_empty_filename(logged_in_client):
+@pytest.mark.parametrize(
+    ("upload", "patches", "status", "error"),
+    [
+        pytest.param(None, {}, 400, "No file part", id="no-file-part"),
+        pytest.param((b"some data", ""), {}, 400, "No selected file", id="empty-name"),
+        pytest.param(
+            (b"malicious content", "virus.exe"),
+            {},
+            400,
+            "File type not allowed. Files must have an extension (e.g., .png, .jpg).",
+            id="disallowed-extension",
+        ),
+        # The limit is patched down so a few bytes count as too large.
+        pytest.param(
+            (b"this content is definitely more than 10 bytes", "large.txt"),
+            {"MAX_CONTENT_LENGTH": 10},
+            400,
+            "File exceeds maximum size limit",
+            id="too-large",
+        ),
+        # A valid file (real PDF header) that Minio then fails to store.
+        pytest.param(
+            (TINY_PDF, "test.pdf"),
+            {"minio_service.upload_file": Mock(return_value=False)},
+            500,
+            "Failed to upload file to storage",
+            id="minio-failure",
+        ),
+    ],
+)
+def test_upload_rejected(
+    logged_in_client, mocker, make_upload, upload, patches, status, error
+):
     """
-    WHEN a file is uploaded but has an empty filename
-    THEN the server should return a 400 Bad Request error.
+    WHEN an upload is missing, misnamed, disallowed, too large, or can't be stored
+    THEN the server returns the matching error and records nothing.
     """
-    file_data = {"file": (io.BytesIO(b"some data"), "")}
-    response = logged_in_client.post("/files/upload", data=file_data)
-    assert response.status_code == 400
-    assert response.json["error"] == "No selected file"
+    for target, value in patches.items():
+        mocker.patch(f"app.blueprints.files.{target}", value)
 
-
-def test_upload_disallowed_extension(logged_in_client):
-    """
-    WHEN a file with a non-whitelisted extension (e.g., .exe) is uploaded
-    THEN the server should return a 400 Bad Request error.
-    """
-    file_data = {"file": (io.BytesIO(b"malicious content"), "virus.exe")}
     response = logged_in_client.post(
-        "/files/upload", data=file_data, content_type="multipart/form-data"
+        "/files/upload",
+        data=make_upload(*upload) if upload else {},
+        content_type="multipart/form-data",
     )
-    assert response.status_code == 400
-    assert "File type not allowed" in response.json["error"]
+
+    assert response.status_code == status
+    assert response.json["error"] == error
+    assert UploadedFile.select().count() == 0
 
 
-def test_upload_file_too_large(logged_in_client, mocker):
+def test_upload_too_large_rejected_before_saving(logged_in_client, mocker, make_upload):
     """
-    WHEN a file is uploaded that exceeds the MAX_CONTENT_LENGTH
-    THEN the server should return a 400 Bad Request error.
+    WHEN a non-image upload is already over the limit on arrival
+    THEN it is rejected without being written to disk or sniffed.
     """
-    # Arrange:
-    # 1. Temporarily reduce the allowed file size for this specific test.
     mocker.patch("app.blueprints.files.MAX_CONTENT_LENGTH", 10)
+    mock_save = mocker.patch("werkzeug.datastructures.FileStorage.save")
+    mock_validate = mocker.patch("app.blueprints.files.validate_upload")
 
-    # 2. Create a file that is larger than our new 10-byte limit.
-    file_data = {
-        "file": (
-            io.BytesIO(b"this content is definitely more than 10 bytes"),
-            "large.txt",
-        )
-    }
-
-    # Act & Assert:
     response = logged_in_client.post(
-        "/files/upload", data=file_data, content_type="multipart/form-data"
+        "/files/upload",
+        data=make_upload(TINY_PDF, "large.pdf"),
+        content_type="multipart/form-data",
     )
+
     assert response.status_code == 400
     assert response.json["error"] == "File exceeds maximum size limit"
-
-
-def test_upload_minio_failure(logged_in_client, mocker):
-    """
-    WHEN the file is valid but the Minio service fails to save it
-    THEN the server should return a 500 Internal Server Error.
-    """
-    # Add this mock to simulate the upload service returning False
-    mocker.patch("app.blueprints.files.minio_service.upload_file", return_value=False)
-
-    # Prepare a valid file (real PDF header so content sniffing passes).
-    file_data = {"file": (io.BytesIO(TINY_PDF), "test.pdf")}
-
-    # Act & Assert:
-    response = logged_in_client.post(
-        "/files/upload", data=file_data, content_type="multipart/form-data"
-    )
-    assert response.status_code == 500
-    assert response.json["error"] == "Failed to upload file to storage"
-
-    # 3. Crucially, ensure no file record was created in our database.
-    assert UploadedFile.select().count() == 0
+    mock_save.assert_not_called()
+    mock_validate.assert_not_called()
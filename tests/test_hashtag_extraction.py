@@ -18,8 +18,6 @@ from app.models import (
     Hashtag,
     Message,
     MessageHashtag,
-    User,
-    Workspace,
 )
 from app.services.chat_service import handle_new_message
 
@@ -92,10 +90,10 @@ class TestHashtagRegex:
 
 
 @pytest.fixture
-def channel_conv(app):
+def channel_conv(app, baseline):
     """A channel conversation we can post into."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="hash-test")
         conv, _ = Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}",
@@ -114,25 +112,23 @@ def _hashtags_for(message: Message) -> set[str]:
 
 
 class TestHashtagIntegration:
-    def test_basic_extraction(self, app, channel_conv):
+    def test_basic_extraction(self, app, channel_conv, user1):
         with app.app_context():
             _, conv_id = channel_conv
             conv = Conversation.get_by_id(conv_id)
-            user = User.get_by_id(1)
             msg = handle_new_message(
-                sender=user, conversation=conv, chat_text="check #urgent now"
+                sender=user1, conversation=conv, chat_text="check #urgent now"
             )
             assert _hashtags_for(msg) == {"urgent"}
 
-    def test_existing_channel_name_is_not_a_hashtag(self, app, channel_conv):
+    def test_existing_channel_name_is_not_a_hashtag(self, app, channel_conv, user1):
         # A real channel exists named "hash-test" — even if a user writes
         # "#hash-test", we shouldn't store it as a hashtag.
         with app.app_context():
             _, conv_id = channel_conv
             conv = Conversation.get_by_id(conv_id)
-            user = User.get_by_id(1)
             msg = handle_new_message(
-                sender=user,
+                sender=user1,
                 conversation=conv,
                 chat_text="see #hash-test for context, plus #other-tag",
             )
@@ -140,13 +136,12 @@ class TestHashtagIntegration:
             assert "hash-test" not in tags
             assert "other-tag" in tags
 
-    def test_duplicate_hashtags_in_one_message_dedup(self, app, channel_conv):
+    def test_duplicate_hashtags_in_one_message_dedup(self, app, channel_conv, user1):
         with app.app_context():
             _, conv_id = channel_conv
             conv = Conversation.get_by_id(conv_id)
-            user = User.get_by_id(1)
             msg = handle_new_message(
-                sender=user,
+                sender=user1,
                 conversation=conv,
                 chat_text="#dup and #dup again",
             )
@@ -157,26 +152,24 @@ class TestHashtagIntegration:
                 == 1
             )
 
-    def test_hashtag_reuses_existing_hashtag_row(self, app, channel_conv):
+    def test_hashtag_reuses_existing_hashtag_row(self, app, channel_conv, user1):
         with app.app_context():
             _, conv_id = channel_conv
             conv = Conversation.get_by_id(conv_id)
-            user = User.get_by_id(1)
             handle_new_message(
-                sender=user, conversation=conv, chat_text="#shared first"
+                sender=user1, conversation=conv, chat_text="#shared first"
             )
             handle_new_message(
-                sender=user, conversation=conv, chat_text="#shared second"
+                sender=user1, conversation=conv, chat_text="#shared second"
             )
             # One Hashtag row total — gets reused.
             assert Hashtag.select().where(Hashtag.name == "shared").count() == 1
 
-    def test_no_hashtags_means_no_rows(self, app, channel_conv):
+    def test_no_hashtags_means_no_rows(self, app, channel_conv, user1):
         with app.app_context():
             _, conv_id = channel_conv
             conv = Conversation.get_by_id(conv_id)
-            user = User.get_by_id(1)
             msg = handle_new_message(
-                sender=user, conversation=conv, chat_text="plain message"
+                sender=user1, conversation=conv, chat_text="plain message"
             )
             assert _hashtags_for(msg) == set()
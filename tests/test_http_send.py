@@ -15,29 +15,28 @@ from app.models import (
     Conversation,
     Message,
     User,
-    Workspace,
     WorkspaceMember,
 )
 
 
 @pytest.fixture
-def channel_member_conv(app):
+def channel_member_conv(app, baseline, user1):
     """A channel conversation the default user (id=1) is a member of."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="http-send-allowed")
         Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
         )
-        ChannelMember.create(user=User.get_by_id(1), channel=channel)
+        ChannelMember.create(user=user1, channel=channel)
         return f"channel_{channel.id}"
 
 
 @pytest.fixture
-def channel_nonmember_conv(app):
+def channel_nonmember_conv(app, baseline):
     """A channel conversation the default user is NOT a member of."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="http-send-forbidden")
         Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
@@ -46,10 +45,10 @@ def channel_nonmember_conv(app):
 
 
 @pytest.fixture
-def dm_conv(app):
+def dm_conv(app, baseline):
     """A DM conversation between user 1 and a fresh partner."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         partner = User.create(
             username="http-partner",
             email="http-partner@example.com",
@@ -102,11 +101,13 @@ def test_dm_participant_can_post(logged_in_client, app, dm_conv, mocker):
     assert res.status_code == 204
 
 
-def test_dm_outsider_post_is_forbidden(logged_in_client, app, dm_conv, mocker):
+def test_dm_outsider_post_is_forbidden(
+    logged_in_client, app, dm_conv, mocker, baseline
+):
     # dm_conv is between user 1 and the partner; user 1 IS a participant, so to
     # test the outsider path we craft a DM id that excludes user 1.
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         a = User.create(username="dm-a", email="dm-a@example.com")
         b = User.create(username="dm-b", email="dm-b@example.com")
         WorkspaceMember.create(user=a, workspace=workspace)
@@ -36,15 +36,14 @@ def test_cookie_session_drops_when_user_deactivated(logged_in_client):
     assert "/" in response.headers["Location"]
 
 
-def test_api_token_rejected_when_user_deactivated(client):
+def test_api_token_rejected_when_user_deactivated(client, user1):
     """
     GIVEN a user with a working API token
     WHEN their account is deactivated
     THEN subsequent token-authenticated calls return 401.
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
 
     login_res = client.post(
         "/api/v1/auth/login", json={"username": "testuser", "password": "password123"}
@@ -67,14 +66,13 @@ def test_api_token_rejected_when_user_deactivated(client):
 # --- Fresh-login paths (a deactivated user tries to authenticate from scratch) ---
 
 
-def test_web_login_refuses_deactivated_user(client):
+def test_web_login_refuses_deactivated_user(client, user1):
     """
     A deactivated user submitting valid credentials on the web /login form gets
     the same generic "invalid" error as wrong-password — no account-status leak.
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
     _set_active(1, False)
 
     response = client.post(
@@ -86,14 +84,13 @@ def test_web_login_refuses_deactivated_user(client):
     assert "Invalid" in response.headers["Location"]
 
 
-def test_api_login_refuses_deactivated_user(client):
+def test_api_login_refuses_deactivated_user(client, user1):
     """
     A deactivated user submitting valid credentials to /api/v1/auth/login gets
     the same 401 + "Invalid credentials" message as wrong-password.
     """
-    user = User.get_by_id(1)
-    user.set_password("password123")
-    user.save()
+    user1.set_password("password123")
+    user1.save()
     _set_active(1, False)
 
     response = client.post(
@@ -17,14 +17,13 @@ from app.routes import MESSAGE_GROUP_WINDOW, PAGE_SIZE, annotate_message_groupin
 
 
 @pytest.fixture
-def setup_conversation(test_db):
+def setup_conversation(test_db, user1):
     """
     A fixture that sets up a common scenario for message tests.
     It creates a second user, a channel, adds both users, and has user1 post a message.
     Returns a dictionary of the created objects.
     """
     # The default 'testuser' (id=1) already exists from conftest.
-    user1 = User.get_by_id(1)
     # Create a second user for authorization tests.
     user2 = User.create(id=2, username="anotheruser", email="another@example.com")
 
@@ -35,8 +34,9 @@ def setup_conversation(test_db):
     )
 
     # Add both users as members of the channel.
-    ChannelMember.create(user=user1, channel=channel)
-    ChannelMember.create(user=user2, channel=channel)
+    ChannelMember.insert_many(
+        [{"user": user1, "channel": channel}, {"user": user2, "channel": channel}]
+    ).execute()
 
     # Create the UserConversationStatus record
     UserConversationStatus.create(user=user1, conversation=conv)
@@ -48,15 +48,34 @@ def setup_conversation(test_db):
     return {"user1": user1, "user2": user2, "message": message}
 
 
+@pytest.fixture(scope="module")
+def shared_conversation(database, baseline):
+    """
+    A channel holding one message from user1, built once per module for tests
+    that only read it. Tests that edit or delete the message, or need a second
+    member, use `setup_conversation` instead.
+    """
+    user1 = baseline.user1
+    channel = Channel.create(workspace=baseline.workspace, name="shared-channel")
+    conv = Conversation.create(
+        conversation_id_str=f"channel_{channel.id}", type="channel"
+    )
+    ChannelMember.create(user=user1, channel=channel)
+    UserConversationStatus.create(user=user1, conversation=conv)
+    message = Message.create(
+        user=user1, conversation=conv, content="Original message content"
+    )
+    return {"user1": user1, "message": message}
+
+
 @pytest.fixture
-def setup_dm_conversation(test_db):
+def setup_dm_conversation(test_db, user1):
     """
     Fixture that creates a direct message conversation. The DM
     initial-load / jump path renders ``dm_messages.html`` and parses the
     ``dm_{a}_{b}`` id, so the newer-fetch and jump flows need dedicated
     coverage for this conversation type.
     """
-    user1 = User.get_by_id(1)
     user2 = User.create(
         id=2, username="dm_partner", email="dm@partner.com", display_name="DM Partner"
     )
@@ -78,26 +97,28 @@ def _seed_context(conversation, user, n_before, n_after):
     window and its ``has_older`` / ``has_newer`` loader flags.
     """
     base = datetime(2026, 7, 8, 8, 0, 0)
-    for i in range(n_before):
-        Message.create(
-            user=user,
-            conversation=conversation,
-            content=f"before {i}",
-            created_at=base + timedelta(minutes=i),
-        )
+
+    def _rows(label, first_minute, count):
+        return [
+            {
+                "user": user,
+                "conversation": conversation,
+                "content": f"{label} {i}",
+                "created_at": base + timedelta(minutes=first_minute + i),
+            }
+            for i in range(count)
+        ]
+
+    if n_before:
+        Message.insert_many(_rows("before", 0, n_before)).execute()
     target = Message.create(
         user=user,
         conversation=conversation,
         content="TARGET MESSAGE",
         created_at=base + timedelta(minutes=n_before),
     )
-    for j in range(n_after):
-        Message.create(
-            user=user,
-            conversation=conversation,
-            content=f"after {j}",
-            created_at=base + timedelta(minutes=n_before + 1 + j),
-        )
+    if n_after:
+        Message.insert_many(_rows("after", n_before + 1, n_after)).execute()
     return target
 
 
@@ -183,13 +204,13 @@ def test_delete_message_unauthorized(logged_in_client, setup_conversation):
     assert Message.get_or_none(id=message.id) is not None  # Verify it was not deleted
 
 
-def test_get_reply_chat_input(logged_in_client, setup_conversation):
+def test_get_reply_chat_input(logged_in_client, shared_conversation):
     """
     WHEN a user clicks the 'reply' button on a message
     THEN the correct reply-context input form should be returned.
     """
-    message = setup_conversation["message"]
-    user = setup_conversation["user1"]
+    message = shared_conversation["message"]
+    user = shared_conversation["user1"]
     response = logged_in_client.get(f"/chat/message/{message.id}/reply")
 
     assert response.status_code == 200
@@ -202,13 +223,13 @@ def test_get_reply_chat_input(logged_in_client, setup_conversation):
     assert f'name="parent_message_id" value="{message.id}"'.encode() in response.data
 
 
-def test_load_message_for_edit_success(logged_in_client, setup_conversation):
+def test_load_message_for_edit_success(logged_in_client, shared_conversation):
     """
     GIVEN a message created by the logged-in user
     WHEN the endpoint to load that message for editing is called
     THEN it should return the chat input partial configured for editing.
     """
-    message = setup_conversation["message"]
+    message = shared_conversation["message"]
     response = logged_in_client.get(f"/chat/message/{message.id}/load_for_edit")
 
     assert response.status_code == 200
@@ -235,30 +256,49 @@ def test_load_message_for_edit_unauthorized(logged_in_client, setup_conversation
     assert response.status_code == 403
 
 
-def test_get_older_messages_success(logged_in_client, setup_conversation):
+@pytest.fixture
+def older_messages(setup_conversation):
     """
-    GIVEN a conversation with more messages than PAGE_SIZE
-    WHEN the client requests older messages before the earliest visible one
-    THEN it should return a batch of older messages.
+    Tops `setup_conversation` up to more than one page of messages and returns
+    the conversation with the earliest message of the new batch as the cursor,
+    so a test's `max_queries` budget only covers the paging request.
     """
     conversation = setup_conversation["message"].conversation
     user = setup_conversation["user1"]
 
-    # Create more messages than one page
-    for i in range(PAGE_SIZE):
-        Message.create(
-            user=user, conversation=conversation, content=f"Older message {i}"
-        )
+    # Create more messages than one page, in a single INSERT
+    Message.insert_many(
+        [
+            {
+                "user": user,
+                "conversation": conversation,
+                "content": f"Older message {i}",
+            }
+            for i in range(PAGE_SIZE)
+        ]
+    ).execute()
 
     # The `setup_conversation` already created one message. We need the ID of the
     # first message in our new batch, which will be the one with the lowest ID after the first.
-    # We fetch all, sort by ID ascending, and get the second one.
-    all_messages = list(
+    # Ask the DB for just that second row rather than loading them all.
+    cursor_message = (
         Message.select()
         .where(Message.conversation == conversation)
         .order_by(Message.id)
+        .offset(1)
+        .first()
     )
-    cursor_message = all_messages[1]
+    return conversation, cursor_message
+
+
+@pytest.mark.max_queries(11)
+def test_get_older_messages_success(logged_in_client, older_messages):
+    """
+    GIVEN a conversation with more messages than PAGE_SIZE
+    WHEN the client requests older messages before the earliest visible one
+    THEN it should return a batch of older messages.
+    """
+    conversation, cursor_message = older_messages
 
     response = logged_in_client.get(
         f"/chat/messages/{conversation.conversation_id_str}?before_message_id={cursor_message.id}"
@@ -271,6 +311,92 @@ def test_get_older_messages_success(logged_in_client, setup_conversation):
     assert b"spinner-border" not in response.data
 
 
+def test_get_older_messages_pages_by_id(logged_in_client, setup_conversation):
+    """
+    GIVEN messages that all share one timestamp
+    WHEN the client pages back from one of them
+    THEN none are skipped, and the next-page trigger only appears when a
+    message exists beyond the page (not merely because the page is full).
+    """
+    conversation = setup_conversation["message"].conversation
+    user = setup_conversation["user1"]
+
+    same_time = datetime(2026, 7, 8, 8, 0, 0)
+    Message.insert_many(
+        [
+            {
+                "user": user,
+                "conversation": conversation,
+                "content": f"same-second {i:02d}",
+                "created_at": same_time,
+            }
+            for i in range(PAGE_SIZE + 1)
+        ]
+    ).execute()
+    batch = list(
+        Message.select(Message.id)
+        .where(Message.content.startswith("same-second"))
+        .order_by(Message.id)
+    )
+    url = f"/chat/messages/{conversation.conversation_id_str}?before_message_id="
+
+    # Below batch[-2]: the original message plus PAGE_SIZE - 1 of the batch,
+    # exactly one page with nothing older.
+    response = logged_in_client.get(f"{url}{batch[-2].id}")
+    assert response.status_code == 200
+    assert b"Original message content" in response.data
+    assert b"same-second 00" in response.data
+    assert f"same-second {PAGE_SIZE - 2:02d}".encode() in response.data
+    assert b"spinner-border" not in response.data
+
+    # Below batch[-1]: one message more than a page, so the trigger appears.
+    response = logged_in_client.get(f"{url}{batch[-1].id}")
+    assert b"spinner-border" in response.data
+    assert b"Original message content" not in response.data
+
+
+def test_first_page_and_older_pages_share_id_order(
+    logged_in_client, setup_conversation
+):
+    """
+    GIVEN a page of messages whose timestamps are older than an earlier-id message
+    WHEN the channel is opened and the client then pages back from the top
+    THEN the first page holds the newest ids and the older page picks up the
+    rest, with nothing shown twice or skipped.
+    """
+    conversation = setup_conversation["message"].conversation
+    user = setup_conversation["user1"]
+    channel_id = conversation.conversation_id_str.split("_")[1]
+
+    # Newer by id, older by time than the "Original message content".
+    Message.insert_many(
+        [
+            {
+                "user": user,
+                "conversation": conversation,
+                "content": f"backdated {i:02d}",
+                "created_at": datetime(2020, 1, 1, 0, 0, i),
+            }
+            for i in range(PAGE_SIZE)
+        ]
+    ).execute()
+    oldest_shown = (
+        Message.select(Message.id).where(Message.content == "backdated 00").get()
+    )
+
+    first_page = logged_in_client.get(f"/chat/channel/{channel_id}")
+    assert b"backdated 00" in first_page.data
+    assert f"backdated {PAGE_SIZE - 1:02d}".encode() in first_page.data
+    assert b"Original message content" not in first_page.data
+
+    older = logged_in_client.get(
+        f"/chat/messages/{conversation.conversation_id_str}"
+        f"?before_message_id={oldest_shown.id}"
+    )
+    assert b"Original message content" in older.data
+    assert b"backdated" not in older.data
+
+
 def test_get_older_messages_errors(logged_in_client, setup_conversation):
     """
     WHEN the get_older_messages endpoint is called with invalid parameters
@@ -433,15 +559,23 @@ def test_newer_pagination_chains_to_next_page(logged_in_client, setup_conversati
     cursor = Message.create(
         user=user, conversation=conversation, content="cursor msg", created_at=base
     )
-    ids = []
-    for i in range(PAGE_SIZE + 5):
-        m = Message.create(
-            user=user,
-            conversation=conversation,
-            content=f"chain {i}",
-            created_at=base + timedelta(minutes=i + 1),
-        )
-        ids.append(m.id)
+    Message.insert_many(
+        [
+            {
+                "user": user,
+                "conversation": conversation,
+                "content": f"chain {i}",
+                "created_at": base + timedelta(minutes=i + 1),
+            }
+            for i in range(PAGE_SIZE + 5)
+        ]
+    ).execute()
+    ids = [
+        m.id
+        for m in Message.select(Message.id)
+        .where(Message.id > cursor.id)
+        .order_by(Message.id)
+    ]
 
     first = logged_in_client.get(
         f"/chat/messages/{conversation.conversation_id_str}?after_message_id={cursor.id}"
@@ -499,12 +633,12 @@ def test_newer_batch_excludes_thread_replies(logged_in_client, setup_conversatio
     assert b"threaded newer body" not in response.data
 
 
-def test_get_message_view(logged_in_client, setup_conversation):
+def test_get_message_view(logged_in_client, shared_conversation):
     """
     WHEN a user requests the standard view for a single message
     THEN it should return the message partial.
     """
-    message = setup_conversation["message"]
+    message = shared_conversation["message"]
     response = logged_in_client.get(f"/chat/message/{message.id}")
 
     assert response.status_code == 200
@@ -576,11 +710,11 @@ def test_react_with_invalid_data(logged_in_client, setup_conversation):
     assert response2.status_code == 400
 
 
-def test_jump_to_message_in_channel(logged_in_client, setup_conversation):
+def test_jump_to_message_in_channel(logged_in_client, shared_conversation):
     """
     Covers: The main success path of `jump_to_message` for a channel message.
     """
-    message = setup_conversation["message"]
+    message = shared_conversation["message"]
     # Get the correct channel directly from the message's conversation,
     # not by randomly selecting the first one from the database.
     channel_id = int(message.conversation.conversation_id_str.split("_")[1])
@@ -598,11 +732,10 @@ def test_jump_to_message_in_channel(logged_in_client, setup_conversation):
     assert message.content.encode() in response.data
 
 
-def test_jump_to_message_in_dm(logged_in_client):
+def test_jump_to_message_in_dm(logged_in_client, user1):
     """
     Covers: The main success path of `jump_to_message` for a DM.
     """
-    user1 = User.get_by_id(1)
     user2 = User.create(
         id=2, username="dm_partner", email="dm@partner.com", display_name="DM Partner"
     )
@@ -818,9 +951,8 @@ def test_get_messages_page_denies_dm_outsider(logged_in_client, test_db):
     assert res.status_code == 403
 
 
-def test_forward_denies_inaccessible_source(logged_in_client, test_db):
+def test_forward_denies_inaccessible_source(logged_in_client, test_db, user1):
     """Forwarding a message from a conversation the user can't see is forbidden."""
-    user1 = User.get_by_id(1)
     outsider = User.create(id=2, username="outsider", email="out@example.com")
 
     # Source channel the user is NOT a member of.
@@ -9,6 +9,8 @@ from app.models import (
     Channel,
     ChannelMember,
     Conversation,
+    Mention,
+    Message,
     User,
     UserConversationStatus,
 )
@@ -16,12 +18,12 @@ from app.services import chat_service
 
 
 @pytest.fixture
-def setup_mention_test(test_db):
+def setup_mention_test(test_db, user1):
     """
     Sets up a sender and a recipient in a channel for testing notifications.
     """
     sender = User.create(id=2, username="sender", email="sender@test.com")
-    recipient = User.get_by_id(1)  # Our default logged-in user
+    recipient = user1  # Our default logged-in user
 
     channel = Channel.get(name="general")
     ChannelMember.create(user=sender, channel=channel)
@@ -30,12 +32,18 @@ def setup_mention_test(test_db):
 
     conversation = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
-    # Set the recipient's last read time to the past so the new message is "unread"
-    status, _ = UserConversationStatus.get_or_create(
-        user=recipient, conversation=conversation
-    )
-    status.last_read_timestamp = datetime.datetime.now() - datetime.timedelta(hours=1)
-    status.save()
+    # Set the recipient's last read time to the past so the new message is
+    # "unread", as one upsert whether or not a status row already exists.
+    an_hour_ago = datetime.datetime.now() - datetime.timedelta(hours=1)
+    UserConversationStatus.insert(
+        user=recipient, conversation=conversation, last_read_timestamp=an_hour_ago
+    ).on_conflict(
+        conflict_target=[
+            UserConversationStatus.user,
+            UserConversationStatus.conversation,
+        ],
+        update={UserConversationStatus.last_read_timestamp: an_hour_ago},
+    ).execute()
 
     return {
         "sender": sender,
@@ -45,7 +53,24 @@ def setup_mention_test(test_db):
     }
 
 
-def test_channel_mention_sends_badge_notification(app, setup_mention_test, mocker):
+@pytest.fixture
+def mention_message(setup_mention_test):
+    """
+    The sender's message @-mentioning the recipient, posted through the chat
+    service in the fixture so a test's `max_queries` budget only covers the
+    notification pass.
+    """
+    return chat_service.handle_new_message(
+        sender=setup_mention_test["sender"],
+        conversation=setup_mention_test["conversation"],
+        chat_text=f"Hello @{setup_mention_test['recipient'].username}, this is a test.",
+    )
+
+
+@pytest.mark.max_queries(6)
+def test_channel_mention_sends_badge_notification(
+    app, setup_mention_test, mention_message, mocker
+):
     """
     GIVEN a sender and an online recipient in a channel
     WHEN the sender posts a message mentioning the recipient
@@ -55,34 +80,28 @@ def test_channel_mention_sends_badge_notification(app, setup_mention_test, mocke
     recipient = setup_mention_test["recipient"]
     conversation = setup_mention_test["conversation"]
     channel = setup_mention_test["channel"]
+    new_message = mention_message
 
     # Mock the chat_manager to spy on its methods
     mock_chat_manager = mocker.patch("app.services.chat_service.chat_manager")
     # Simulate that the recipient is online
     mock_chat_manager.all_clients = {recipient.id: Mock()}
 
-    # Create the new message with a mention
-    new_message = chat_service.handle_new_message(
-        sender=sender,
-        conversation=conversation,
-        chat_text=f"Hello @{recipient.username}, this is a test.",
-    )
-
-    # --- ACT ---
-    # Manually call the notification function we are testing
-    # We must do this within an app context to use url_for
+    # --- ACT / ASSERT ---
+    # Both the notification pass and rendering the expected HTML need
+    # url_for, so they share one app context.
     with app.app_context():
+        # Manually call the notification function we are testing
         chat_service.send_notifications_for_new_message(new_message, sender)
 
-    # --- ASSERT ---
-    # 1. Generate the exact HTML we expect to be sent
-    with app.app_context():
+        # 1. Generate the exact HTML we expect to be sent
+        channel_url = url_for("channels.get_channel_chat", channel_id=channel.id)
         expected_badge_html = render_template(
             "partials/unread_badge.html",
             conv_id_str=conversation.conversation_id_str,
             count=1,  # We expect a count of 1 for this new mention
             link_text=f"# {channel.name}",
-            hx_get_url=url_for("channels.get_channel_chat", channel_id=channel.id),
+            hx_get_url=channel_url,
         )
         expected_unreads_link_html = render_template(
             "partials/unreads_link_unread.html"
@@ -135,3 +154,63 @@ def test_channel_mention_sends_badge_notification(app, setup_mention_test, mocke
             assert args[1]["body"] == new_message.content
             break
     assert found_notification_call, "Desktop notification payload was not sent"
+
+
+@pytest.fixture
+def channel_mentioning(test_db, mention_count):
+    """
+    A channel message from a fresh sender that @-mentions `mention_count`
+    other members, each with unread history. Built in the fixture so a test's
+    `max_queries` budget only covers the notification pass.
+    """
+    channel = Channel.get(name="general")
+    conversation = Conversation.get(conversation_id_str=f"channel_{channel.id}")
+    sender = User.create(username="loud_sender", email="loud@test.com")
+    recipients = [
+        User.create(username=f"listener{i}", email=f"listener{i}@test.com")
+        for i in range(mention_count)
+    ]
+    an_hour_ago = datetime.datetime.now() - datetime.timedelta(hours=1)
+    ChannelMember.insert_many(
+        [{"user": u, "channel": channel} for u in [sender, *recipients]]
+    ).execute()
+    UserConversationStatus.insert_many(
+        [
+            {
+                "user": u,
+                "conversation": conversation,
+                "last_read_timestamp": an_hour_ago,
+            }
+            for u in recipients
+        ]
+    ).execute()
+    message = Message.create(
+        user=sender,
+        conversation=conversation,
+        content=" ".join(f"@{u.username}" for u in recipients),
+    )
+    Mention.insert_many([{"user": u, "message": message} for u in recipients]).execute()
+    return sender, message
+
+
+@pytest.mark.parametrize("mention_count", [1, 5])
+@pytest.mark.max_queries(6)
+def test_mention_notifications_query_count_is_flat(app, channel_mentioning, mocker):
+    """
+    The notification pass reads statuses, mentions and unread mention counts
+    for all recipients at once, so mentioning five people costs the same
+    number of queries as mentioning one.
+    """
+    sender, message = channel_mentioning
+    mock_chat_manager = mocker.patch("app.services.chat_service.chat_manager")
+    mocker.patch("app.services.chat_service._dispatch_push_notifications")
+
+    with app.app_context():
+        chat_service.send_notifications_for_new_message(message, sender)
+
+    badge_calls = [
+        c
+        for c in mock_chat_manager.send_to_user.call_args_list
+        if isinstance(c.args[1], dict) and "api_data" in c.args[1]
+    ]
+    assert {c.args[1]["api_data"]["data"]["unread_count"] for c in badge_calls} == {1}
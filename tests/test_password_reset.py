@@ -21,13 +21,12 @@ SECRET = "test-secret-key-at-least-32-chars-long"
 
 
 @pytest.fixture
-def user_with_password(app):
+def user_with_password(app, user1):
     """Set a known password on the test user (id=1)."""
     with app.app_context():
-        user = User.get_by_id(1)
-        user.set_password("OriginalPwd12345!")
-        user.save()
-        return user.id
+        user1.set_password("OriginalPwd12345!")
+        user1.save()
+        return user1.id
 
 
 # --- auth_tokens unit tests ------------------------------------------------
@@ -1,13 +1,12 @@
 # tests/test_polls.py
 import pytest
 
-from app.models import Channel, Conversation, Message, Poll, PollOption, User, Vote
+from app.models import Channel, Conversation, Message, Poll, PollOption, Vote
 
 
 @pytest.fixture
-def setup_poll(test_db):
+def setup_poll(test_db, user1):
     """Fixture to set up a basic poll in the general channel."""
-    user1 = User.get_by_id(1)
     channel = Channel.get(name="general")
     conv = Conversation.get(conversation_id_str=f"channel_{channel.id}")
 
@@ -1,11 +1,16 @@
 # tests/test_profile.py
 
 import io
+import re
+
+import pytest
 
 from app.models import UploadedFile, User
 
+_WS = re.compile(rb"\s+")
+
 
-def test_update_address_success(logged_in_client):
+def test_update_address_success(logged_in_client, user1):
     """
     GIVEN a logged-in user
     WHEN they submit valid data to the update_address endpoint
@@ -19,96 +24,99 @@ def test_update_address_success(logged_in_client):
     assert b"profile-header-card" in response.data
     assert b"Toronto" in response.data
 
-    user = User.get_by_id(1)
+    user = User.get_by_id(user1.id)
     assert user.country == "Canada"
     assert user.city == "Toronto"
     assert user.timezone == "EST"
 
 
-def test_update_presence_status_success(logged_in_client):
+def test_update_presence_status_success(logged_in_client, user1):
     """
     GIVEN a logged-in user with 'online' status
     WHEN they submit a valid new status ('away')
     THEN their status should be updated in the database.
     """
-    user = User.get_by_id(1)
-    assert user.presence_status == "online"
+    assert user1.presence_status == "online"
 
     response = logged_in_client.put("/profile/status", data={"status": "away"})
     assert response.status_code == 200
     assert b"profile-header-card" in response.data
 
     # Re-fetch the user from the database to get the updated values.
-    updated_user = User.get_by_id(1)
+    updated_user = User.get_by_id(user1.id)
     assert updated_user.presence_status == "away"
 
 
-def test_update_presence_status_invalid(logged_in_client):
-    """
-    GIVEN a logged-in user
-    WHEN they submit an invalid status
-    THEN they should get a 400 error and their status should not change.
-    """
-    user = User.get_by_id(1)
-    assert user.presence_status == "online"
-
-    response = logged_in_client.put(
-        "/profile/status", data={"status": "invalid-status"}
-    )
-    assert response.status_code == 400
-    assert b"Invalid status" in response.data
-
-    # Re-fetch the user to verify their status did not change.
-    updated_user = User.get_by_id(1)
-    assert updated_user.presence_status == "online"
-
-
-def test_update_theme_success(logged_in_client):
+def test_update_theme_success(logged_in_client, user1):
     """
     GIVEN a logged-in user with the 'system' theme
     WHEN they submit a valid new theme ('dark')
     THEN their theme should be updated and they should receive an HX-Refresh header.
     """
-    user = User.get_by_id(1)
-    assert user.theme == "system"
+    assert user1.theme == "system"
 
     response = logged_in_client.put("/profile/theme", data={"theme": "dark"})
     assert response.status_code == 200
     assert response.headers.get("HX-Refresh") == "true"
 
     # Re-fetch the user to verify the new theme was saved.
-    updated_user = User.get_by_id(1)
+    updated_user = User.get_by_id(user1.id)
     assert updated_user.theme == "dark"
 
 
-def test_update_theme_invalid(logged_in_client):
+@pytest.mark.parametrize(
+    ("endpoint", "data", "field", "error"),
+    [
+        pytest.param(
+            "/profile/status",
+            {"status": "invalid-status"},
+            "presence_status",
+            b"Invalid status",
+            id="presence-status",
+        ),
+        pytest.param(
+            "/profile/theme",
+            {"theme": "invalid-theme"},
+            "theme",
+            b"Invalid theme",
+            id="theme",
+        ),
+        pytest.param(
+            "/profile/notification_sound",
+            {"sound": "invalid-sound.wav"},
+            "notification_sound",
+            b"Invalid sound choice",
+            id="notification-sound",
+        ),
+    ],
+)
+def test_update_preference_invalid(
+    logged_in_client, user1, endpoint, data, field, error
+):
     """
     GIVEN a logged-in user
-    WHEN they submit an invalid theme
-    THEN they should get a 400 error and their theme should not change.
+    WHEN they submit an invalid status, theme or notification sound
+    THEN they should get a 400 error and the stored value should not change.
     """
-    user = User.get_by_id(1)
-    assert user.theme == "system"
+    original = getattr(user1, field)
 
-    response = logged_in_client.put("/profile/theme", data={"theme": "invalid-theme"})
+    response = logged_in_client.put(endpoint, data=data)
     assert response.status_code == 400
-    assert b"Invalid theme" in response.data
+    assert error in response.data
 
-    # Re-fetch the user to verify their theme did not change.
-    updated_user = User.get_by_id(1)
-    assert updated_user.theme == "system"
-    assert user.theme == "system"
+    # Re-fetch the user to verify the value did not change.
+    updated_user = User.get_by_id(user1.id)
+    assert getattr(updated_user, field) == original
 
 
-def test_get_address_display_partial(logged_in_client):
+def test_get_address_display_partial(logged_in_client, user1):
     """
     WHEN a user's address display partial is requested
     THEN it should return the correct partial with the user's info.
     """
     # First, set some data on the user to check for
-    user = User.get_by_id(1)
-    user.city = "Testville"
-    user.save()
+    user1.city = "Testville"
+    user1.save()
 
     response = logged_in_client.get("/profile/address/view")
     assert response.status_code == 200
@@ -116,38 +124,45 @@ def test_get_address_display_partial(logged_in_client):
     assert b"form-label" in response.data  # Check for label, indicating display view
 
 
-def test_get_address_form_partial(logged_in_client):
+def test_get_address_form_partial(logged_in_client, user1):
     """
     WHEN a user's address edit form is requested
     THEN it should return the form partial with the user's info pre-filled.
     """
     # First, set some data on the user to check for
-    user = User.get_by_id(1)
-    user.country = "Testland"
-    user.save()
+    user1.country = "Testland"
+    user1.save()
 
     response = logged_in_client.get("/profile/address/edit")
     assert response.status_code == 200
 
     expected_html = b'<input type="text" class="form-control" id="country" name="country" value="Testland">'
-    # Replace newlines and carriage returns, then replace multiple spaces with a single space
-    response_html_flat = (
-        response.data.replace(b"\n", b"").replace(b"\r", b"").replace(b"  ", b"")
-    )
+    # Collapse every whitespace run (newlines, tabs, indentation) to one space
+    response_html_flat = _WS.sub(b" ", response.data)
 
     # The assertion is now much more reliable.
     assert expected_html in response_html_flat
 
 
-def test_set_wysiwyg_preference(logged_in_client):
+def test_user1_edits_are_rolled_back(user1):
+    """
+    GIVEN the two tests above set and saved user1's city and country
+    WHEN a later test takes user1
+    THEN both the cached instance and the stored row hold the seeded values.
+    """
+    assert (user1.city, user1.country) == (None, None)
+    stored = User.get_by_id(user1.id)
+    assert (stored.city, stored.country) == (None, None)
+
+
+def test_set_wysiwyg_preference(logged_in_client, user1):
     """
     GIVEN a logged-in user with WYSIWYG disabled by default
     WHEN they send a request to enable it
     THEN their preference should be updated in the database.
     """
     # 1. Verify the initial state (default is False)
-    user = User.get_by_id(1)
-    assert user.wysiwyg_enabled is False
+    assert user1.wysiwyg_enabled is False
 
     # 2. Send the request to enable the feature
     response = logged_in_client.put(
@@ -158,7 +173,7 @@ def test_set_wysiwyg_preference(logged_in_client):
     assert response.status_code == 204
 
     # 3. Verify the change was persisted in the database
-    updated_user = User.get_by_id(1)
+    updated_user = User.get_by_id(user1.id)
     assert updated_user.wysiwyg_enabled is True
 
     # 4. Now, test turning it back off
@@ -166,25 +181,10 @@ def test_set_wysiwyg_preference(logged_in_client):
         "/chat/user/preference/wysiwyg", data={"wysiwyg_enabled": "false"}
     )
     assert response_off.status_code == 204
-    user_turned_off = User.get_by_id(1)
+    user_turned_off = User.get_by_id(user1.id)
     assert user_turned_off.wysiwyg_enabled is False
 
 
-def test_update_theme_invalid_two(logged_in_client):
-    """
-    Covers: `update_theme` error path for invalid theme value.
-    """
-    user = User.get_by_id(1)
-    original_theme = user.theme
-
-    response = logged_in_client.put("/profile/theme", data={"theme": "invalid-theme"})
-    assert response.status_code == 400
-    assert b"Invalid theme" in response.data
-
-    user = User.get_by_id(user.id)
-    assert user.theme == original_theme
-
-
 def test_profile_access(logged_in_client):
     """
     WHEN the '/profile' partial is requested by a logged-in user
@@ -198,14 +198,13 @@ def test_profile_access(logged_in_client):
     assert b"Test User" in response.data
 
 
-def test_update_notification_sound_success(logged_in_client):
+def test_update_notification_sound_success(logged_in_client, user1):
     """
     GIVEN a logged-in user
     WHEN they submit a valid new sound preference
     THEN their preference should be updated and a trigger event fired.
     """
-    user = User.get_by_id(1)
-    assert user.notification_sound == "d8-notification.mp3"
+    assert user1.notification_sound == "d8-notification.mp3"
 
     response = logged_in_client.put(
         "/profile/notification_sound", data={"sound": "slack-notification.mp3"}
@@ -215,28 +214,10 @@ def test_update_notification_sound_success(logged_in_client):
     assert "HX-Trigger" in response.headers
     assert "update-sound-preference" in response.headers["HX-Trigger"]
 
-    updated_user = User.get_by_id(1)
+    updated_user = User.get_by_id(user1.id)
     assert updated_user.notification_sound == "slack-notification.mp3"
 
 
-def test_update_notification_sound_invalid(logged_in_client):
-    """
-    GIVEN a logged-in user
-    WHEN they submit an invalid sound preference
-    THEN they should receive a 400 error and their preference should not change.
-    """
-    user = User.get_by_id(1)
-    original_sound = user.notification_sound
-
-    response = logged_in_client.put(
-        "/profile/notification_sound", data={"sound": "invalid-sound.wav"}
-    )
-
-    assert response.status_code == 400
-    updated_user = User.get_by_id(1)
-    assert updated_user.notification_sound == original_sound
-
-
 def test_upload_avatar_success(logged_in_client, mocker):
     """
     GIVEN a valid image file
@@ -288,7 +269,9 @@ def test_upload_avatar_preserves_gif_animation(logged_in_client, mocker):
     )
 
     # Build a 3-frame animated GIF in memory.
-    frames = [Image.new("RGB", (48, 48), c) for c in ((255, 0, 0), (0, 255, 0), (0, 0, 255))]
+    frames = [
+        Image.new("RGB", (48, 48), c) for c in ((255, 0, 0), (0, 255, 0), (0, 0, 255))
+    ]
     buf = io.BytesIO()
     frames[0].save(
         buf, format="GIF", save_all=True, append_images=frames[1:], duration=100, loop=0
@@ -79,13 +79,13 @@ def test_register_device_idempotent_refresh(client):
     assert DeviceToken.select().where(DeviceToken.token == "fcm-refresh").count() == 1
 
 
-def test_register_device_reassigns_across_users(client):
+def test_register_device_reassigns_across_users(client, baseline):
     """A reprovisioned device that re-registers under a new user reassigns the row."""
     # Seed a second user and grab their token.
     other = User.create(
         id=2, username="alice", email="alice@example.com", display_name="Alice"
     )
-    ws = Workspace.get(Workspace.name == "DevOcho")
+    ws = baseline.workspace
     WorkspaceMember.create(user=other, workspace=ws)
     other.set_password("alicepw1")
     other.save()
@@ -228,9 +228,8 @@ def test_send_to_user_no_op_when_user_has_no_tokens(app, monkeypatch):
     assert sent.call_count == 0
 
 
-def test_send_to_user_dispatches_and_marks_last_used(app, monkeypatch):
-    user = User.get_by_id(1)
-    DeviceToken.create(user=user, platform="android", token="good-token")
+def test_send_to_user_dispatches_and_marks_last_used(app, monkeypatch, user1):
+    DeviceToken.create(user=user1, platform="android", token="good-token")
 
     def fake_send(message, app=None):
         return SimpleNamespace(
@@ -241,7 +240,7 @@ def test_send_to_user_dispatches_and_marks_last_used(app, monkeypatch):
     _force_firebase_configured(monkeypatch, sent)
 
     with app.app_context():
-        push_service.send_to_user(user.id, title="Hi", body="Body", data={"k": "v"})
+        push_service.send_to_user(user1.id, title="Hi", body="Body", data={"k": "v"})
 
     sent.assert_called_once()
     sent_msg = sent.call_args.args[0]
@@ -253,10 +252,9 @@ def test_send_to_user_dispatches_and_marks_last_used(app, monkeypatch):
     assert row.last_used_at is not None
 
 
-def test_send_to_user_prunes_stale_tokens(app, monkeypatch):
-    user = User.get_by_id(1)
-    DeviceToken.create(user=user, platform="android", token="stale")
-    DeviceToken.create(user=user, platform="android", token="alive")
+def test_send_to_user_prunes_stale_tokens(app, monkeypatch, user1):
+    DeviceToken.create(user=user1, platform="android", token="stale")
+    DeviceToken.create(user=user1, platform="android", token="alive")
 
     class StaleExc(Exception):
         code = "UNREGISTERED"
@@ -272,16 +270,15 @@ def test_send_to_user_prunes_stale_tokens(app, monkeypatch):
     _force_firebase_configured(monkeypatch, MagicMock(side_effect=fake_send))
 
     with app.app_context():
-        push_service.send_to_user(user.id, title="t", body="b")
+        push_service.send_to_user(user1.id, title="t", body="b")
 
     remaining = {row.token for row in DeviceToken.select()}
     assert remaining == {"alive"}
 
 
-def test_send_to_user_keeps_token_on_unknown_error(app, monkeypatch):
+def test_send_to_user_keeps_token_on_unknown_error(app, monkeypatch, user1):
     """Transient FCM errors must not prune the token (would lose delivery permanently)."""
-    user = User.get_by_id(1)
-    DeviceToken.create(user=user, platform="android", token="transient")
+    DeviceToken.create(user=user1, platform="android", token="transient")
 
     class TransientExc(Exception):
         code = "INTERNAL"
@@ -293,21 +290,20 @@ def test_send_to_user_keeps_token_on_unknown_error(app, monkeypatch):
 
     _force_firebase_configured(monkeypatch, MagicMock(side_effect=fake_send))
     with app.app_context():
-        push_service.send_to_user(user.id, title="t", body="b")
+        push_service.send_to_user(user1.id, title="t", body="b")
 
     assert DeviceToken.select().where(DeviceToken.token == "transient").exists()
 
 
-def test_send_to_user_swallows_send_exception(app, monkeypatch):
+def test_send_to_user_swallows_send_exception(app, monkeypatch, user1):
     """An exception raised by the SDK itself must not propagate."""
-    user = User.get_by_id(1)
-    DeviceToken.create(user=user, platform="android", token="x")
+    DeviceToken.create(user=user1, platform="android", token="x")
 
     _force_firebase_configured(
         monkeypatch, MagicMock(side_effect=RuntimeError("connection lost"))
     )
     with app.app_context():
-        push_service.send_to_user(user.id, title="t", body="b")  # must not raise
+        push_service.send_to_user(user1.id, title="t", body="b")  # must not raise
 
 
 # ---------------------------------------------------------------------------
@@ -339,14 +335,14 @@ def _make_channel(name="random", members=()):
     return channel, conv
 
 
-def test_dispatch_no_op_when_push_not_configured(app, monkeypatch):
+def test_dispatch_no_op_when_push_not_configured(app, monkeypatch, user1):
     """The whole push pass must short-circuit when Firebase isn't set up."""
     monkeypatch.setattr(push_service, "is_configured", lambda: False)
     sent = MagicMock()
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         other, conv = _make_dm()
         msg = Message.create(user=sender, conversation=conv, content="hi")
         chat_service.send_notifications_for_new_message(msg, sender)
@@ -354,14 +350,14 @@ def test_dispatch_no_op_when_push_not_configured(app, monkeypatch):
     sent.assert_not_called()
 
 
-def test_dm_pushes_to_offline_recipient(app, monkeypatch):
+def test_dm_pushes_to_offline_recipient(app, monkeypatch, user1):
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: False)
     sent = MagicMock()
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         other, conv = _make_dm(other_id=42)
         msg = Message.create(user=sender, conversation=conv, content="hello")
         chat_service.send_notifications_for_new_message(msg, sender)
@@ -374,14 +370,14 @@ def test_dm_pushes_to_offline_recipient(app, monkeypatch):
     assert kwargs["data"]["message_id"] == msg.id
 
 
-def test_dm_skips_online_recipient(app, monkeypatch):
+def test_dm_skips_online_recipient(app, monkeypatch, user1):
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: True)
     sent = MagicMock()
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         other, conv = _make_dm(other_id=43)
         msg = Message.create(user=sender, conversation=conv, content="hello")
         chat_service.send_notifications_for_new_message(msg, sender)
@@ -389,7 +385,7 @@ def test_dm_skips_online_recipient(app, monkeypatch):
     sent.assert_not_called()
 
 
-def test_sender_never_pushed_for_own_message(app, monkeypatch):
+def test_sender_never_pushed_for_own_message(app, monkeypatch, user1):
     """A self-DM (or any path that surfaces the sender) must not push the sender."""
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: False)
@@ -397,7 +393,7 @@ def test_sender_never_pushed_for_own_message(app, monkeypatch):
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         # Self-DM: only the sender appears in user_ids.
         conv = Conversation.create(conversation_id_str="dm_1_1", type="dm")
         msg = Message.create(user=sender, conversation=conv, content="note to self")
@@ -406,21 +402,21 @@ def test_sender_never_pushed_for_own_message(app, monkeypatch):
     sent.assert_not_called()
 
 
-def test_mention_pushes_offline_user(app, monkeypatch):
+def test_mention_pushes_offline_user(app, monkeypatch, baseline, user1):
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: False)
     sent = MagicMock()
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         mentioned = User.create(
             id=2,
             username="alice",
             email="alice@example.com",
             display_name="Alice",
         )
-        ws = Workspace.get(Workspace.name == "DevOcho")
+        ws = baseline.workspace
         WorkspaceMember.create(user=mentioned, workspace=ws)
         channel, conv = _make_channel("ops", members=[sender, mentioned])
 
@@ -431,7 +427,7 @@ def test_mention_pushes_offline_user(app, monkeypatch):
     assert mentioned.id in target_ids
 
 
-def test_thread_reply_pushes_prior_participants(app, monkeypatch):
+def test_thread_reply_pushes_prior_participants(app, monkeypatch, baseline, user1):
     """Thread replies push to everyone who replied earlier AND the thread starter."""
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: False)
@@ -439,10 +435,10 @@ def test_thread_reply_pushes_prior_participants(app, monkeypatch):
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        starter = User.get_by_id(1)
+        starter = user1
         replier_a = User.create(id=2, username="a", email="a@x.com", display_name="A")
         replier_b = User.create(id=3, username="b", email="b@x.com", display_name="B")
-        ws = Workspace.get(Workspace.name == "DevOcho")
+        ws = baseline.workspace
         WorkspaceMember.create(user=replier_a, workspace=ws)
         WorkspaceMember.create(user=replier_b, workspace=ws)
         channel, conv = _make_channel(
@@ -474,7 +470,7 @@ def test_thread_reply_pushes_prior_participants(app, monkeypatch):
     assert replier_b.id not in target_ids
 
 
-def test_at_channel_does_not_push(app, monkeypatch):
+def test_at_channel_does_not_push(app, monkeypatch, baseline, user1):
     """@channel intentionally does NOT trigger push in v1."""
     monkeypatch.setattr(push_service, "is_configured", lambda: True)
     monkeypatch.setattr(chat_manager, "is_user_online_in_cluster", lambda uid: False)
@@ -482,9 +478,9 @@ def test_at_channel_does_not_push(app, monkeypatch):
     monkeypatch.setattr(push_service, "send_to_user", sent)
 
     with app.app_context():
-        sender = User.get_by_id(1)
+        sender = user1
         other = User.create(id=2, username="c", email="c@x.com", display_name="C")
-        ws = Workspace.get(Workspace.name == "DevOcho")
+        ws = baseline.workspace
         WorkspaceMember.create(user=other, workspace=ws)
         channel, conv = _make_channel("general2", members=[sender, other])
 
@@ -0,0 +1,68 @@
+# tests/test_rate_limit.py
+#
+# Flask-Limiter can only be (re)initialized on an app that hasn't served a
+# request yet, and the shared `app` fixture is session-scoped, so each test in
+# this module builds a fresh app of its own.
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app import create_app
+from app.models import db
+
+
+@pytest.fixture
+def fresh_app():
+    """
+    A new app, built per test, that has not served any requests. `create_app`
+    points the global `db` proxy at a new in-memory database; it is pointed
+    back at the session's database straight away so this app shares the
+    seeded schema, and again on teardown so later tests never see another
+    binding whatever this one did.
+    """
+    session_db = db.obj
+    try:
+        with patch("redis.from_url", return_value=Mock()):
+            app = create_app(config_class="config.TestConfig")
+        db.initialize(session_db)
+        yield app
+    finally:
+        db.initialize(session_db)
+
+
+def test_rate_limit_returns_json(fresh_app):
+    """
+    GIVEN rate limiting is enabled
+    WHEN a client exceeds the login rate limit
+    THEN the 429 response should be JSON, not HTML
+    """
+    from app import limiter
+
+    app = fresh_app
+    app.config["RATELIMIT_ENABLED"] = True
+    app.config["RATELIMIT_STORAGE_URI"] = "memory://"
+    limiter.init_app(app)
+
+    try:
+        with app.test_client() as client:
+            for _ in range(10):
+                client.post(
+                    "/api/v1/auth/login", json={"username": "x", "password": "y"}
+                )
+
+            res = client.post(
+                "/api/v1/auth/login", json={"username": "x", "password": "y"}
+            )
+    finally:
+        # The limiter is a process-wide singleton; switch it back off (and
+        # forget the hits) so it can't leak into the shared app.
+        app.config["RATELIMIT_ENABLED"] = False
+        limiter.reset()
+        limiter.enabled = False
+
+    assert res.status_code == 429
+    data = res.get_json()
+    assert data is not None, "429 response must be JSON, not HTML"
+    assert data["error"] == "Rate limit exceeded"
+    assert "detail" in data
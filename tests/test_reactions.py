@@ -1,16 +1,26 @@
+import re
+
 import pytest
 from app.models import User, Channel, ChannelMember, Conversation, Message, Reaction
 
+# One rendered reaction pill (partials/reactions.html): its extra classes, the
+# reactor ids and the emoji, so a page's pills can be checked in one scan.
+_REACTION_PILL = re.compile(
+    rb'<button class="btn btn-sm reaction-pill ?([^"]*)"\s+'
+    rb'data-reactor-ids="([^"]*)".*?<span>(.*?)</span>',
+    re.S,
+)
+
 
 @pytest.fixture
-def setup_message(test_db):
+def setup_message(test_db, user1):
     """A fixture that creates a channel with two users and a message from user1."""
-    user1 = User.get_by_id(1)
     user2 = User.create(id=2, username="user_two", email="two@example.com")
 
     channel = Channel.create(workspace_id=1, name="reaction-channel")
-    ChannelMember.create(user=user1, channel=channel)
-    ChannelMember.create(user=user2, channel=channel)
+    ChannelMember.insert_many(
+        [{"user": user1, "channel": channel}, {"user": user2, "channel": channel}]
+    ).execute()
 
     conv, _ = Conversation.get_or_create(
         conversation_id_str=f"channel_{channel.id}", type="channel"
@@ -31,7 +41,7 @@ def test_add_reaction_success(logged_in_client, setup_message):
     message = setup_message["message"]
     emoji_char = "👍"
 
-    assert Reaction.select().count() == 0
+    assert not Reaction.select().exists()
 
     response = logged_in_client.post(
         f"/chat/message/{message.id}/react", data={"emoji": emoji_char}
@@ -41,7 +51,6 @@ def test_add_reaction_success(logged_in_client, setup_message):
 
     reaction = Reaction.get_or_none(message=message, user_id=1, emoji=emoji_char)
     assert reaction is not None
-    assert Reaction.select().count() == 1
 
 
 def test_toggle_reaction_removes_it(logged_in_client, setup_message):
@@ -57,7 +66,9 @@ def test_toggle_reaction_removes_it(logged_in_client, setup_message):
     logged_in_client.post(
         f"/chat/message/{message.id}/react", data={"emoji": emoji_char}
     )
-    assert Reaction.select().count() == 1
+    assert (
+        Reaction.get_or_none(message=message, user_id=1, emoji=emoji_char) is not None
+    )
 
     # Now, "toggle" it by sending the same request again
     response = logged_in_client.post(
@@ -65,7 +76,7 @@ def test_toggle_reaction_removes_it(logged_in_client, setup_message):
     )
 
     assert response.status_code == 200
-    assert Reaction.select().count() == 0
+    assert not Reaction.select().exists()
 
 
 def test_loading_chat_shows_existing_reactions(logged_in_client, setup_message):
@@ -85,13 +96,9 @@ def test_loading_chat_shows_existing_reactions(logged_in_client, setup_message):
     # User 1 (the logged_in_client) loads the channel
     response = logged_in_client.get(f"/chat/channel/{channel.id}")
 
-    assert response.status_code == 200
-    # Check that the emoji is present in the response
-    assert emoji_char.encode() in response.data
-    # Check that the HTML contains the data attribute with user 2's ID
-    assert b'data-reactor-ids="2"' in response.data
-    # Check that the highlight class is NOT present, because user 1 didn't react
-    assert b'class="btn btn-sm reaction-pill user-reacted"' not in response.data
+    # A single pill for the emoji, reacted by user 2 only, and without the
+    # `user-reacted` highlight because user 1 didn't react
+    assert _REACTION_PILL.findall(response.data) == [(b"", b"2", emoji_char.encode())]
 
 
 def test_react_to_nonexistent_message(logged_in_client):
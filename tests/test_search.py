@@ -15,17 +15,19 @@ from app.models import (
 SEARCH_PAGE_SIZE = 20
 
 
-@pytest.fixture
-def search_setup(test_db, logged_in_client):
+@pytest.fixture(scope="module")
+def search_setup(database, baseline):
     """
-    Creates a rich environment for testing search functionality.
+    Creates a rich environment for testing search functionality, once per
+    module: tests only read it, and anything a test adds on top (extra
+    messages, channels or users) rolls back with its `test_db` savepoint.
     - user1 (logged in, from conftest)
     - user2, user3
     - A public channel, a private channel user1 can see, and a private channel user1 cannot see.
     - DMs between (user1, user2) and (user2, user3).
     - Messages with unique keywords scattered across these conversations.
     """
-    user1 = User.get_by_id(1)
+    user1 = baseline.user1
     user2 = User.create(
         id=2, username="user_two", email="two@example.com", display_name="Zelda Smith"
     )
@@ -36,24 +38,30 @@ def search_setup(test_db, logged_in_client):
         display_name="Link Jones",
     )
 
-    workspace = WorkspaceMember.get(user=user1).workspace
-    WorkspaceMember.create(user=user2, workspace=workspace)
-    WorkspaceMember.create(user=user3, workspace=workspace)
+    workspace = baseline.workspace
+    WorkspaceMember.insert_many(
+        [
+            {"user": user2, "workspace": workspace},
+            {"user": user3, "workspace": workspace},
+        ]
+    ).execute()
 
     # --- Channels ---
     public_chan = Channel.create(workspace=workspace, name="public-searchable")
-    ChannelMember.create(user=user1, channel=public_chan)
-    ChannelMember.create(user=user2, channel=public_chan)
-
     private_chan_visible = Channel.create(
         workspace=workspace, name="private-visible", is_private=True
     )
-    ChannelMember.create(user=user1, channel=private_chan_visible)
-
     private_chan_hidden = Channel.create(
         workspace=workspace, name="private-hidden", is_private=True
     )
-    ChannelMember.create(user=user2, channel=private_chan_hidden)
+    ChannelMember.insert_many(
+        [
+            {"user": user1, "channel": public_chan},
+            {"user": user2, "channel": public_chan},
+            {"user": user1, "channel": private_chan_visible},
+            {"user": user2, "channel": private_chan_hidden},
+        ]
+    ).execute()
 
     # --- Conversations ---
     pub_conv, _ = Conversation.get_or_create(
@@ -70,19 +78,40 @@ def search_setup(test_db, logged_in_client):
     )  # Inaccessible to user1
 
     # --- Messages ---
-    Message.create(user=user1, conversation=pub_conv, content="A message about apples.")
-    Message.create(
-        user=user2, conversation=priv_vis_conv, content="A message about carrots."
-    )
-    Message.create(user=user1, conversation=dm_conv1, content="A message about grapes.")
-    Message.create(
-        user=user2, conversation=dm_conv2, content="A secret message about oranges."
-    )  # Inaccessible
-
-    UserConversationStatus.create(user=user1, conversation=dm_conv1)
-    UserConversationStatus.create(user=user2, conversation=dm_conv1)
-    UserConversationStatus.create(user=user2, conversation=dm_conv2)
-    UserConversationStatus.create(user=user3, conversation=dm_conv2)
+    Message.insert_many(
+        [
+            {
+                "user": user1,
+                "conversation": pub_conv,
+                "content": "A message about apples.",
+            },
+            {
+                "user": user2,
+                "conversation": priv_vis_conv,
+                "content": "A message about carrots.",
+            },
+            {
+                "user": user1,
+                "conversation": dm_conv1,
+                "content": "A message about grapes.",
+            },
+            # Inaccessible
+            {
+                "user": user2,
+                "conversation": dm_conv2,
+                "content": "A secret message about oranges.",
+            },
+        ]
+    ).execute()
+
+    UserConversationStatus.insert_many(
+        [
+            {"user": user1, "conversation": dm_conv1},
+            {"user": user2, "conversation": dm_conv1},
+            {"user": user2, "conversation": dm_conv2},
+            {"user": user3, "conversation": dm_conv2},
+        ]
+    ).execute()
 
     return {
         "user1": user1,
@@ -101,19 +130,16 @@ def test_search_for_accessible_messages(logged_in_client, search_setup):
     """
     # Test searching for a message in a public channel
     res1 = logged_in_client.get("/chat/search?q=apples")
-    assert res1.status_code == 200
     # The template uses curly quotes, so we check for that in the response.
     assert b"Search results for \xe2\x80\x9capples\xe2\x80\x9d" in res1.data
     assert b"# public-searchable" in res1.data  # Check context
 
     # Test searching for a message in a private channel the user is in
     res2 = logged_in_client.get("/chat/search?q=carrots")
-    assert res2.status_code == 200
     assert b"# private-visible" in res2.data
 
     # Test searching for a message in a DM
     res3 = logged_in_client.get("/chat/search?q=grapes")
-    assert res3.status_code == 200
     assert b"Zelda Smith" in res3.data  # DM partner's display name
 
 
@@ -123,7 +149,6 @@ def test_search_does_not_find_inaccessible_messages(logged_in_client, search_set
     THEN no results should be returned.
     """
     response = logged_in_client.get("/chat/search?q=oranges")
-    assert response.status_code == 200
     assert b"No messages found matching your search." in response.data
 
 
@@ -133,7 +158,6 @@ def test_search_for_channels(logged_in_client, search_setup):
     THEN public channels and private channels the user is a member of should be found.
     """
     response = logged_in_client.get("/chat/search?q=searchable")
-    assert response.status_code == 200
     assert (
         b'Channels <span class="badge rounded-pill search-count-hit">1</span>'
         in response.data
@@ -193,7 +217,6 @@ def test_empty_search_returns_nothing(logged_in_client):
     THEN the response should be an empty container, not an error.
     """
     response = logged_in_client.get("/chat/search?q=")
-    assert response.status_code == 200
     assert response.data == b'<div id="search-results-content"></div>'
 
 
@@ -208,10 +231,16 @@ def test_search_messages_pagination(logged_in_client, search_setup):
         conversation_id_str=f"channel_{search_setup['public_channel'].id}"
     )
     # Create one more message than the page size to trigger pagination
-    for i in range(SEARCH_PAGE_SIZE + 1):
-        Message.create(
-            user=user1, conversation=pub_conv, content=f"PAGINATION_TEST message {i}"
-        )
+    Message.insert_many(
+        [
+            {
+                "user": user1,
+                "conversation": pub_conv,
+                "content": f"PAGINATION_TEST message {i}",
+            }
+            for i in range(SEARCH_PAGE_SIZE + 1)
+        ]
+    ).execute()
 
     # Initial search
     res1 = logged_in_client.get("/chat/search?q=PAGINATION_TEST")
@@ -220,7 +249,6 @@ def test_search_messages_pagination(logged_in_client, search_setup):
 
     # Paginated search for page 2
     res2 = logged_in_client.get("/chat/search/messages?q=PAGINATION_TEST&page=2")
-    assert res2.status_code == 200
     # The response will contain the highlighted search term.
     assert b"<mark>PAGINATION_TEST</mark> message 0" in res2.data
     assert (
@@ -243,7 +271,6 @@ def test_search_for_message_in_dm_to_self(logged_in_client, search_setup):
     )
 
     response = logged_in_client.get("/chat/search?q=kryptonite")
-    assert response.status_code == 200
     # The context should show the user's own name with "(you)"
     assert b"Test User (you)" in response.data
 
@@ -280,10 +307,10 @@ def test_search_message_body_xss_is_escaped(logged_in_client, search_setup):
     assert b"<mark>tetris</mark>" in res.data  # highlighting still works
 
 
-def test_search_channel_name_xss_is_escaped(logged_in_client, search_setup):
+def test_search_channel_name_xss_is_escaped(logged_in_client, search_setup, baseline):
     """A channel name containing HTML is escaped in search results, not executed."""
     user1 = search_setup["user1"]
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     evil_chan = Channel.create(workspace=workspace, name=f"{XSS_PAYLOAD}-tetrischan")
     ChannelMember.create(user=user1, channel=evil_chan)
 
@@ -294,10 +321,9 @@ def test_search_channel_name_xss_is_escaped(logged_in_client, search_setup):
     assert b"<mark>tetrischan</mark>" in res.data
 
 
-def test_search_user_name_xss_is_escaped(logged_in_client, search_setup):
+def test_search_user_name_xss_is_escaped(logged_in_client, search_setup, baseline):
     """A display name containing HTML is escaped in search results, not executed."""
-    user1 = search_setup["user1"]
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     evil_user = User.create(
         id=99,
         username="tetrisuser",
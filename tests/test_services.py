@@ -10,8 +10,6 @@ from app.models import (
     Message,
     MessageAttachment,
     UploadedFile,
-    User,
-    WorkspaceMember,
 )
 from app.services import chat_service, minio_service
 
@@ -19,12 +17,11 @@ from app.services import chat_service, minio_service
 
 
 @pytest.fixture
-def setup_channel_and_users_for_service(test_db):
+def setup_channel_and_users_for_service(test_db, user1, baseline):
     """
     A dedicated fixture for service-layer tests. Creates users and a conversation.
     """
-    user1 = User.get_by_id(1)
-    workspace = WorkspaceMember.get(user=user1).workspace
+    workspace = baseline.workspace
     channel = Channel.create(workspace=workspace, name="service-test-channel")
     conv, _ = Conversation.get_or_create(
         conversation_id_str=f"channel_{channel.id}", type="channel"
@@ -57,30 +54,6 @@ def test_get_presigned_url(mocker):
     assert kwargs["object_name"] == "my-object-name.jpg"
 
 
-def test_get_presigned_url_handles_s3error(mocker):
-    """
-    GIVEN a mocked Minio client that raises an S3Error
-    WHEN get_presigned_url is called
-    THEN it should catch the exception and return None.
-    """
-    # Arrange: Configure the mock to raise a correctly instantiated S3Error.
-    mock_client = mocker.patch("app.services.minio_service.minio_client_public")
-    mock_client.presigned_get_object.side_effect = S3Error(
-        code="DummyCode",
-        message="Test S3 Error",
-        resource="dummy",
-        request_id="dummy",
-        host_id="dummy",
-        response=None,
-    )
-
-    # Act
-    url = minio_service.get_presigned_url("any-object.jpg")
-
-    # Assert
-    assert url is None
-
-
 def test_delete_file_success(mocker):
     """
     GIVEN a mocked Minio client
@@ -100,77 +73,97 @@ def test_delete_file_success(mocker):
     )
 
 
-def test_delete_file_handles_s3error(mocker):
+def test_upload_file_service_success(mocker, tmp_path):
     """
-    GIVEN a mocked Minio client that raises an S3Error
-    WHEN delete_file is called
-    THEN it should catch the exception and return False.
+    GIVEN a real file on disk and a mocked Minio client
+    WHEN minio_service.upload_file is called
+    THEN it should call the Minio client's put_object and return True.
     """
-    # Arrange
+    # Arrange: a real temp file, so nothing global like open/os.stat is patched
     mock_client = mocker.patch("app.services.minio_service.minio_client_internal")
-    mock_client.remove_object.side_effect = S3Error(
+    file_path = tmp_path / "file.txt"
+    file_path.write_bytes(b"test data")
+
+    # Act
+    result = minio_service.upload_file(
+        object_name="new-file.txt",
+        file_path=str(file_path),
+        content_type="text/plain",
+    )
+
+    # Assert
+    assert result is True
+    mock_client.put_object.assert_called_once()
+    assert mock_client.put_object.call_args.kwargs["length"] == 9
+
+
+def _s3_error():
+    """A correctly instantiated S3Error for mocked Minio calls to raise."""
+    return S3Error(
         code="DummyCode",
-        message="Test S3 Delete Error",
+        message="Test S3 Error",
         resource="dummy",
         request_id="dummy",
         host_id="dummy",
         response=None,
     )
 
-    # Act
-    result = minio_service.delete_file("a-file.txt")
-
-    # Assert
-    assert result is False
-
 
-def test_upload_file_service_success(mocker):
+@pytest.mark.parametrize(
+    ("client", "method", "call", "expected"),
+    [
+        pytest.param(
+            "minio_client_public",
+            "presigned_get_object",
+            lambda: minio_service.get_presigned_url("any-object.jpg"),
+            None,
+            id="get-presigned-url",
+        ),
+        pytest.param(
+            "minio_client_internal",
+            "remove_object",
+            lambda: minio_service.delete_file("a-file.txt"),
+            False,
+            id="delete-file",
+        ),
+    ],
+)
+def test_minio_service_handles_s3error(mocker, client, method, call, expected):
     """
-    GIVEN a valid file path and mocked dependencies
-    WHEN minio_service.upload_file is called
-    THEN it should call the Minio client's put_object and return True.
+    GIVEN a mocked Minio client whose call raises an S3Error
+    WHEN the matching minio_service function is called
+    THEN it should catch the exception and return its failure value.
     """
     # Arrange
-    mock_client = mocker.patch("app.services.minio_service.minio_client_internal")
-    mocker.patch("builtins.open", mocker.mock_open(read_data=b"test data"))
-    mocker.patch("os.stat").return_value.st_size = 9  # Mock file size
+    mock_client = mocker.patch(f"app.services.minio_service.{client}")
+    getattr(mock_client, method).side_effect = _s3_error()
 
     # Act
-    result = minio_service.upload_file(
-        object_name="new-file.txt",
-        file_path="/fake/path/file.txt",
-        content_type="text/plain",
-    )
+    result = call()
 
     # Assert
-    assert result is True
-    mock_client.put_object.assert_called_once()
+    assert result is expected
+    getattr(mock_client, method).assert_called_once()
 
 
-def test_upload_file_service_handles_s3error(mocker):
+def test_upload_file_handles_s3error(mocker, tmp_path):
     """
-    GIVEN the Minio client will raise an error
+    GIVEN a mocked Minio client whose put_object raises an S3Error
     WHEN minio_service.upload_file is called
-    THEN it should catch the error and return False.
+    THEN it should catch the exception and return False.
     """
-    # Arrange
+    # Arrange: upload_file reads a real file before calling put_object
     mock_client = mocker.patch("app.services.minio_service.minio_client_internal")
-    mock_client.put_object.side_effect = S3Error(
-        code="DummyCode",
-        message="Upload Failed",
-        resource="d",
-        request_id="r",
-        host_id="h",
-        response=None,
-    )
-    mocker.patch("builtins.open", mocker.mock_open(read_data=b"test data"))
-    mocker.patch("os.stat").return_value.st_size = 9
+    mock_client.put_object.side_effect = _s3_error()
+    file_path = tmp_path / "fail.txt"
+    file_path.write_bytes(b"test data")
 
     # Act
-    result = minio_service.upload_file("fail.txt", "/fake/path/fail.txt", "text/plain")
+    result = minio_service.upload_file("fail.txt", str(file_path), "text/plain")
 
     # Assert
     assert result is False
+    mock_client.put_object.assert_called_once()
 
 
 def test_handle_new_message_with_attachments(setup_channel_and_users_for_service):
@@ -182,20 +175,28 @@ def test_handle_new_message_with_attachments(setup_channel_and_users_for_service
     # Arrange
     sender = setup_channel_and_users_for_service["sender"]
     conversation = setup_channel_and_users_for_service["conversation"]
-    # Create dummy UploadedFile records to link to
-    file1 = UploadedFile.create(
-        uploader=sender,
-        original_filename="f1.txt",
-        stored_filename="s1.txt",
-        mime_type="text/plain",
-        file_size_bytes=1,
-    )
-    file2 = UploadedFile.create(
-        uploader=sender,
-        original_filename="f2.jpg",
-        stored_filename="s2.jpg",
-        mime_type="image/jpeg",
-        file_size_bytes=1,
+    # Create dummy UploadedFile records to link to, in one INSERT ... RETURNING
+    file1, file2 = (
+        UploadedFile.insert_many(
+            [
+                {
+                    "uploader": sender,
+                    "original_filename": "f1.txt",
+                    "stored_filename": "s1.txt",
+                    "mime_type": "text/plain",
+                    "file_size_bytes": 1,
+                },
+                {
+                    "uploader": sender,
+                    "original_filename": "f2.jpg",
+                    "stored_filename": "s2.jpg",
+                    "mime_type": "image/jpeg",
+                    "file_size_bytes": 1,
+                },
+            ]
+        )
+        .returning(UploadedFile.id)
+        .execute()
     )
 
     attachment_ids_str = f"{file1.id},{file2.id}"
@@ -1,9 +1,33 @@
 # tests/test_sso.py
 
+import pytest
+
 from app.models import Channel, ChannelMember, User, Workspace, WorkspaceMember
 
 
-def test_sso_callback_creates_new_user(client, mocker):
+@pytest.fixture
+def sso_callback(client, mocker):
+    """
+    A factory: `sso_callback(user_info, **get_kwargs)` stubs the Authlib token
+    exchange so the provider "returns" `user_info`, seeds the session nonce the
+    callback expects, then requests our /auth callback and returns the response.
+    """
+    mocker.patch(
+        "app.sso.oauth.authentik.authorize_access_token",
+        return_value={"access_token": "fake_token"},
+    )
+    parse_id_token = mocker.patch("app.sso.oauth.authentik.parse_id_token")
+
+    def _callback(user_info, **get_kwargs):
+        parse_id_token.return_value = user_info
+        with client.session_transaction() as sess:
+            sess["nonce"] = "test_nonce"
+        return client.get("/auth", **get_kwargs)
+
+    return _callback
+
+
+def test_sso_callback_creates_new_user(sso_callback):
     """
     GIVEN a new user authenticating via SSO for the first time
     WHEN the SSO provider redirects them back to our /auth callback
@@ -16,21 +40,10 @@ def test_sso_callback_creates_new_user(client, mocker):
         "given_name": "Newbie",
     }
 
-    # 2. Mock the external Authlib calls
-    mocker.patch(
-        "app.sso.oauth.authentik.authorize_access_token",
-        return_value={"access_token": "fake_token"},
-    )
-    mocker.patch("app.sso.oauth.authentik.parse_id_token", return_value=fake_user_info)
-
-    # 3. Set up the session, since our app expects a 'nonce' to be present
-    with client.session_transaction() as sess:
-        sess["nonce"] = "test_nonce"
-
-    # 4. Make the request to our callback endpoint
-    response = client.get("/auth", follow_redirects=True)
+    # 2. Make the request to our callback endpoint with the Authlib calls mocked
+    response = sso_callback(fake_user_info, follow_redirects=True)
 
-    # --- 5. Assert the results ---
+    # --- 3. Assert the results ---
 
     # Assert we were redirected to the chat page, indicating a successful login
     assert response.status_code == 200
@@ -59,21 +72,14 @@ def test_sso_callback_creates_new_user(client, mocker):
     )
 
 
-def test_sso_callback_fails_with_incomplete_info(client, mocker):
+def test_sso_callback_fails_with_incomplete_info(sso_callback):
     """
     Covers: `handle_auth_callback` error path when SSO provider data is missing.
     """
     # Simulate the SSO provider returning data WITHOUT the required 'sub' (subject ID)
     fake_user_info = {"email": "new.user@example.com", "given_name": "Newbie"}
-    mocker.patch(
-        "app.sso.oauth.authentik.authorize_access_token",
-        return_value={"access_token": "fake_token"},
-    )
-    mocker.patch("app.sso.oauth.authentik.parse_id_token", return_value=fake_user_info)
-    with client.session_transaction() as sess:
-        sess["nonce"] = "test_nonce"
 
-    response = client.get("/auth", follow_redirects=True)
+    response = sso_callback(fake_user_info, follow_redirects=True)
 
     # Should redirect back to the login page with an error
     assert response.status_code == 200
@@ -82,7 +88,7 @@ def test_sso_callback_fails_with_incomplete_info(client, mocker):
     assert b"did not return required information" in response.data
 
 
-def test_sso_callback_links_existing_user(client, mocker):
+def test_sso_callback_links_existing_user(sso_callback):
     """
     Covers: `handle_auth_callback` logic for an existing user logging in via SSO for the first time.
     """
@@ -101,19 +107,10 @@ def test_sso_callback_links_existing_user(client, mocker):
         "given_name": "Existing Updated Name",
     }
 
-    # 3. Mock the external Authlib calls
-    mocker.patch(
-        "app.sso.oauth.authentik.authorize_access_token",
-        return_value={"access_token": "fake_token"},
-    )
-    mocker.patch("app.sso.oauth.authentik.parse_id_token", return_value=fake_user_info)
-    with client.session_transaction() as sess:
-        sess["nonce"] = "test_nonce"
+    # 3. Make the request to our callback endpoint
+    sso_callback(fake_user_info)  # We don't need to check the response here
 
-    # 4. Make the request to our callback endpoint
-    client.get("/auth")  # We don't need to check the response here
-
-    # 5. Assert that the existing user record was updated, not a new one created.
+    # 4. Assert that the existing user record was updated, not a new one created.
     updated_user = User.get(User.email == "existing.user@example.com")
     assert updated_user.id == existing_user.id  # Should be the same user ID
     assert (
@@ -124,7 +121,7 @@ def test_sso_callback_links_existing_user(client, mocker):
     )  # Details should be updated from SSO
 
 
-def test_sso_new_user_handles_missing_defaults(client, mocker):
+def test_sso_new_user_handles_missing_defaults(sso_callback):
     """
     Covers: `handle_auth_callback` warning paths for missing default workspace/channels.
     """
@@ -136,16 +133,9 @@ def test_sso_new_user_handles_missing_defaults(client, mocker):
         "email": "new.user2@example.com",
         "given_name": "Defaultless",
     }
-    mocker.patch(
-        "app.sso.oauth.authentik.authorize_access_token",
-        return_value={"access_token": "fake_token"},
-    )
-    mocker.patch("app.sso.oauth.authentik.parse_id_token", return_value=fake_user_info)
-    with client.session_transaction() as sess:
-        sess["nonce"] = "test_nonce"
 
     # This should run without error, even though the workspace is missing.
     # The function will print warnings, which is what we are covering.
-    response = client.get("/auth", follow_redirects=True)
+    response = sso_callback(fake_user_info, follow_redirects=True)
     assert response.status_code == 200
     assert response.request.path == "/chat"
@@ -7,8 +7,6 @@ with libmagic, the bytes are matched against an explicit allowlist, and the
 sniffed MIME (not the client one) is what we persist.
 """
 
-import io
-
 import pytest
 
 from app.models import UploadedFile
@@ -142,10 +140,7 @@ class TestAvatarSubset:
 
 
 class TestApiUploadEndpoint:
-    def _login(self, client):
-        from app.models import User
-
-        user = User.get_by_id(1)
+    def _login(self, client, user):
         user.set_password("password123")
         user.save()
         res = client.post(
@@ -154,17 +149,17 @@ class TestApiUploadEndpoint:
         )
         return res.get_json()["api_token"]
 
-    def test_renamed_exe_rejected_with_400(self, client, mocker):
+    def test_renamed_exe_rejected_with_400(self, client, mocker, make_upload, user1):
         """End-to-end: the upload endpoint refuses an exe-as-png and never
         reaches MinIO or the DB."""
         upload_mock = mocker.patch(
             "app.blueprints.api_v1.minio_service.upload_file", return_value=True
         )
-        token = self._login(client)
+        token = self._login(client, user1)
 
         res = client.post(
             "/api/v1/files/upload",
-            data={"file": (io.BytesIO(WINDOWS_EXE_HEADER), "evil.png")},
+            data=make_upload(WINDOWS_EXE_HEADER, "evil.png"),
             content_type="multipart/form-data",
             headers={"Authorization": f"Bearer {token}"},
         )
@@ -174,25 +169,23 @@ class TestApiUploadEndpoint:
         upload_mock.assert_not_called()
         assert UploadedFile.select().count() == 0
 
-    def test_lying_content_type_does_not_persist(self, client, mocker):
+    def test_lying_content_type_does_not_persist(
+        self, client, mocker, make_upload, user1
+    ):
         """Even when the multipart Content-Type lies, the persisted MIME is
         whatever libmagic actually sniffed from the bytes."""
         mocker.patch(
             "app.blueprints.api_v1.minio_service.upload_file", return_value=True
         )
-        token = self._login(client)
+        token = self._login(client, user1)
 
         # Real PNG bytes, but the multipart Content-Type claims it's something
         # else. We should ignore that header and persist image/png.
         res = client.post(
             "/api/v1/files/upload",
-            data={
-                "file": (
-                    io.BytesIO(TINY_PNG),
-                    "x.png",
-                    "application/x-malware-pretending-to-be-png",
-                )
-            },
+            data=make_upload(
+                TINY_PNG, "x.png", "application/x-malware-pretending-to-be-png"
+            ),
             content_type="multipart/form-data",
             headers={"Authorization": f"Bearer {token}"},
         )
@@ -201,14 +194,14 @@ class TestApiUploadEndpoint:
         assert res.get_json()["mime_type"] == "image/png"
         assert UploadedFile.get().mime_type == "image/png"
 
-    def test_dropped_html_extension_rejected(self, client):
+    def test_dropped_html_extension_rejected(self, client, make_upload, user1):
         """HTML uploads were on the allowlist before; now they're refused
         outright with no chance to slip through via lying bytes."""
-        token = self._login(client)
+        token = self._login(client, user1)
 
         res = client.post(
             "/api/v1/files/upload",
-            data={"file": (io.BytesIO(b"<h1>hi</h1>"), "page.html")},
+            data=make_upload(b"<h1>hi</h1>", "page.html"),
             content_type="multipart/form-data",
             headers={"Authorization": f"Bearer {token}"},
         )
@@ -218,14 +211,14 @@ class TestApiUploadEndpoint:
 
 
 class TestWebUploadEndpoint:
-    def test_renamed_exe_rejected_with_400(self, logged_in_client, mocker):
+    def test_renamed_exe_rejected_with_400(self, logged_in_client, mocker, make_upload):
         upload_mock = mocker.patch(
             "app.blueprints.files.minio_service.upload_file", return_value=True
         )
 
         res = logged_in_client.post(
             "/files/upload",
-            data={"file": (io.BytesIO(WINDOWS_EXE_HEADER), "evil.png")},
+            data=make_upload(WINDOWS_EXE_HEADER, "evil.png"),
             content_type="multipart/form-data",
         )
 
@@ -233,20 +226,16 @@ class TestWebUploadEndpoint:
         upload_mock.assert_not_called()
         assert UploadedFile.select().count() == 0
 
-    def test_lying_content_type_persists_sniffed_mime(self, logged_in_client, mocker):
+    def test_lying_content_type_persists_sniffed_mime(
+        self, logged_in_client, mocker, make_upload
+    ):
         mocker.patch(
             "app.blueprints.files.minio_service.upload_file", return_value=True
         )
 
         res = logged_in_client.post(
             "/files/upload",
-            data={
-                "file": (
-                    io.BytesIO(TINY_PNG),
-                    "x.png",
-                    "application/x-evil",
-                )
-            },
+            data=make_upload(TINY_PNG, "x.png", "application/x-evil"),
             content_type="multipart/form-data",
         )
 
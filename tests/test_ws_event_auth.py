@@ -22,30 +22,29 @@ from app.models import (
     Conversation,
     Message,
     User,
-    Workspace,
     WorkspaceMember,
 )
 from app.routes import _process_ws_event, _safe_handle_frame
 
 
 @pytest.fixture
-def channel_and_member(app):
+def channel_and_member(app, baseline, user1):
     """A channel the test user IS a member of."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="ws-auth-allowed")
         Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
         )
-        ChannelMember.create(user=User.get_by_id(1), channel=channel)
+        ChannelMember.create(user=user1, channel=channel)
         return channel.id
 
 
 @pytest.fixture
-def channel_no_member(app):
+def channel_no_member(app, baseline):
     """A channel the test user is NOT a member of."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         channel = Channel.create(workspace=workspace, name="ws-auth-forbidden")
         Conversation.get_or_create(
             conversation_id_str=f"channel_{channel.id}", defaults={"type": "channel"}
@@ -54,10 +53,10 @@ def channel_no_member(app):
 
 
 @pytest.fixture
-def dm_with_partner(app):
+def dm_with_partner(app, baseline):
     """A DM conversation between user 1 and a freshly created user 2."""
     with app.app_context():
-        workspace = Workspace.get(Workspace.name == "DevOcho")
+        workspace = baseline.workspace
         partner = User.create(
             username="ws-partner",
             email="ws-partner@example.com",
@@ -149,12 +148,14 @@ class TestDeniedSends:
             handle_new_message.assert_not_called()
             assert Message.select().where(Message.content == "spam").count() == 0
 
-    def test_outsider_send_to_dm_is_dropped(self, app, dm_with_partner, mocker):
+    def test_outsider_send_to_dm_is_dropped(
+        self, app, dm_with_partner, mocker, baseline
+    ):
         with app.app_context():
             partner_id, conv_id = dm_with_partner
 
             # Create a third user who is not part of the DM.
-            workspace = Workspace.get(Workspace.name == "DevOcho")
+            workspace = baseline.workspace
             outsider = User.create(
                 username="ws-outsider",
                 email="ws-outsider@example.com",
@@ -263,10 +264,12 @@ class TestSubscribeAuth:
 
             sub.assert_not_called()
 
-    def test_outsider_subscribe_to_dm_is_denied(self, app, dm_with_partner, mocker):
+    def test_outsider_subscribe_to_dm_is_denied(
+        self, app, dm_with_partner, mocker, baseline
+    ):
         with app.app_context():
             _, conv_id = dm_with_partner
-            workspace = Workspace.get(Workspace.name == "DevOcho")
+            workspace = baseline.workspace
             outsider = User.create(
                 username="ws-sub-outsider",
                 email="ws-sub-outsider@example.com",